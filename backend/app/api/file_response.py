@@ -0,0 +1,174 @@
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+# Archived files never change under their URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Generated journals are revalidated with their ETag on every view
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def pdf_file_response(
+    request: Request,
+    path: str,
+    file_hash: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = REVALIDATE_CACHE_CONTROL
+) -> Response:
+    """
+    Serve a PDF with validation and byte-range support.
+
+    Starlette's FileResponse in this version neither answers conditional
+    requests nor serves ranges, which pdf.js uses to load pages lazily.
+
+    - ``If-None-Match`` (or ``If-Modified-Since`` without it) answers 304.
+    - A single ``Range: bytes=...`` answers 206 with only those bytes, or
+      416 if it is outside the file; ``If-Range`` that does not match the
+      current ETag or Last-Modified falls back to the whole file. Multiple
+      ranges are not supported and get the whole file, as HTTP allows.
+
+    Args:
+        request: Incoming request
+        path: Path to PDF file
+        file_hash: Stored SHA-256 of the file; gives a strong ETag. Without
+            it the ETag is weak, derived from mtime and size, and is not
+            used for If-Range.
+        filename: Download name (attachment); shown inline without it
+        cache_control: Cache-Control header value
+
+    Returns:
+        Response
+    """
+    stat = os.stat(path)
+    etag = f'"{file_hash}"' if file_hash else f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename)
+
+    if _not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = _parse_range(range_header, stat.st_size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{stat.st_size}"}
+            )
+
+    if byte_range is None:
+        return FileResponse(
+            path,
+            media_type="application/pdf",
+            headers=headers,
+            stat_result=stat
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _read_range(path, start, end),
+        status_code=206,
+        media_type="application/pdf",
+        headers=headers
+    )
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: W/ prefixes are ignored
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _if_range_matches(request: Request, etag: str, last_modified: str) -> bool:
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if if_range.startswith('"'):
+        # Strong comparison; weak ETags never match
+        return not etag.startswith("W/") and if_range == etag
+    return if_range == last_modified
+
+
+def _content_disposition(filename: str) -> str:
+    # Same header as FileResponse, non-ASCII names per RFC 5987
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Returns:
+        (start, end) inclusive, or None to serve the whole file; invalid
+        ranges such as ``bytes=5-3`` are ignored like a missing header
+
+    Raises:
+        ValueError: Range cannot be satisfied
+    """
+    match = BYTE_RANGE.match(header.replace(" ", ""))
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    # Sync iterator: Starlette reads it in the thread pool
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import RedirectResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
 import uuid
 import os
 import shutil
+import asyncio
 
 from app.db.database import get_db
 from app.db.models import Archive, GenerationTask
 from app.models.archive import ArchiveResponse, ArchiveCreate
 from app.services.pdf_generator import PDFGenerator
+from app.services.pdf_optimizer import pdf_optimizer
+from app.services.upload_storage import file_sha256
+from app.api.file_response import pdf_file_response, IMMUTABLE_CACHE_CONTROL
 from app.core.config import settings
 
 router = APIRouter()
@@ -107,9 +111,14 @@ async def save_to_archive(
     archive_path = os.path.join(archive_dir, filename)
     shutil.copy2(task.result_path, archive_path)
 
+    # Journals built before optimization was enabled are linearized here;
+    # already linearized files are left as they are
+    await asyncio.to_thread(pdf_optimizer.optimize, archive_path)
+
     # Get PDF info
     pages = pdf_generator.get_pdf_page_count(archive_path)
     file_size = os.path.getsize(archive_path)
+    file_hash = await asyncio.to_thread(file_sha256, archive_path)
 
     # Get articles count from task
     # Note: In production, you'd track this in the GenerationTask
@@ -123,7 +132,8 @@ async def save_to_archive(
         file_url=archive_path,
         pages=pages,
         articles_count=articles_count,
-        file_size=file_size
+        file_size=file_size,
+        file_hash=file_hash
     )
 
     db.add(archive)
@@ -136,6 +146,7 @@ async def save_to_archive(
 @router.get("/{archive_id}/view")
 async def view_archive(
     archive_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -152,15 +163,18 @@ async def view_archive(
     if not os.path.exists(archive.file_url):
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
+    return pdf_file_response(
+        request,
         archive.file_url,
-        media_type="application/pdf"
+        file_hash=archive.file_hash,
+        cache_control=IMMUTABLE_CACHE_CONTROL
     )
 
 
 @router.get("/{archive_id}/download")
 async def download_archive(
     archive_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -177,10 +191,12 @@ async def download_archive(
     if not os.path.exists(archive.file_url):
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
+    return pdf_file_response(
+        request,
         archive.file_url,
-        media_type="application/pdf",
-        filename=archive.filename
+        file_hash=archive.file_hash,
+        filename=archive.filename,
+        cache_control=IMMUTABLE_CACHE_CONTROL
     )
 
 
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
 import uuid
 import os
+import json
+import asyncio
 
 from app.db.database import get_db
 from app.db.models import Article, Session as DBSession
 from app.models.article import ArticleResponse, ArticleUpdate
 from app.services.docx_parser import DocxParser
+from app.services.heuristic_extractor import HeuristicExtractor
+from app.services.journal_builder import pages_for_words
 from app.services.sorter import ArticleSorter
+from app.services.progress_bus import progress_bus, articles_channel
 
 router = APIRouter()
 docx_parser = DocxParser()
@@ -33,6 +39,42 @@ async def get_articles(
     return articles
 
 
+@router.get("/events")
+async def stream_article_updates(
+    request: Request,
+    session_id: str = Query(...)
+):
+    """
+    Stream article updates of a session as Server-Sent Events.
+
+    Each event is an ArticleResponse, sent when background metadata
+    extraction of an article finishes. Fetch the article list after
+    subscribing to get the current state.
+    """
+    subscription = await progress_bus.subscribe(articles_channel(uuid.UUID(session_id)))
+
+    async def event_stream():
+        try:
+            # Opens the stream right away, so the client knows it is subscribed
+            yield ": subscribed\n\n"
+            while True:
+                event = await subscription.get(timeout=15)
+                if event is None:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{article_id}", response_model=ArticleResponse)
 async def get_article(
     article_id: str,
@@ -74,6 +116,9 @@ async def update_article(
         article.title = update_data.title
     if update_data.author is not None:
         article.author = update_data.author
+        # Sorting goes by the script of the author name
+        article.language = HeuristicExtractor.detect_language(update_data.author)
+    # Pending articles stay pending: extraction fills the fields not edited
 
     await db.commit()
     await db.refresh(article)
@@ -123,23 +168,29 @@ async def preview_article(
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    try:
-        # Extract preview text (first 500 words)
-        text = docx_parser.extract_text(article.file_path, max_chars=3000)
-        words = text.split()[:500]
-        preview_text = ' '.join(words)
-
-        # Estimate pages (rough: 500 words per page)
-        full_text = docx_parser.get_full_text(article.file_path)
-        word_count = len(full_text.split())
-        pages_estimate = max(1, word_count // 500)
-
-        return {
-            "text": preview_text,
-            "pages_estimate": pages_estimate
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading article: {str(e)}")
+    # Statistics are stored at ingest; parse only articles not processed yet
+    text_head = article.text_head
+    word_count = article.word_count
+    if text_head is None or word_count is None:
+        try:
+            document = await asyncio.to_thread(docx_parser.parse, article.file_path)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error reading article: {str(e)}")
+        text_head = document.head_text(max_chars=3000)
+        word_count = document.word_count
+
+    # Preview text (first 500 words)
+    preview_text = ' '.join(text_head.split()[:500])
+
+    # Converted page count when known, else the estimate used by the builder
+    pages_estimate = article.page_count or pages_for_words(word_count)
+
+    return {
+        "text": preview_text,
+        "pages_estimate": pages_estimate,
+        "word_count": word_count,
+        "image_count": article.image_count
+    }
 
 
 @router.post("/sort")
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import defer
 import uuid
 import os
+import json
+import asyncio
 from typing import Dict, Optional
 
 from app.db.database import get_db
@@ -16,86 +19,18 @@ from app.models.journal import (
 )
 from app.services.pdf_generator import PDFGenerator
 from app.services.journal_builder import JournalBuilder
-from app.core.config import settings
+from app.services.progress_bus import progress_bus, generation_channel, generation_event
+from app.worker import generate_journal
+from app.api.file_response import pdf_file_response
 
 router = APIRouter()
 pdf_generator = PDFGenerator()
 journal_builder = JournalBuilder(pdf_generator)
 
 
-async def generate_journal_task(
-    task_id: uuid.UUID,
-    article_ids: list,
-    template_dict: dict,
-    settings_dict: dict
-):
-    """
-    Background task for journal generation.
-    """
-    from app.db.database import async_session_maker
-
-    async with async_session_maker() as db:
-        try:
-            # Get task
-            result = await db.execute(
-                select(GenerationTask).where(GenerationTask.id == task_id)
-            )
-            task = result.scalar_one()
-
-            # Get articles
-            result = await db.execute(
-                select(Article).where(Article.id.in_(article_ids))
-            )
-            articles = result.scalars().all()
-
-            # Sort articles if not already sorted
-            articles = sorted(articles, key=lambda a: a.sort_order or 0)
-
-            # Get templates
-            templates = {}
-            for key, template_id in template_dict.items():
-                if template_id:
-                    result = await db.execute(
-                        select(Template).where(Template.id == uuid.UUID(template_id))
-                    )
-                    templates[key] = result.scalar_one_or_none()
-                else:
-                    templates[key] = None
-
-            # Build journal
-            from app.models.journal import JournalSettings
-            journal_settings = JournalSettings(**settings_dict)
-
-            output_path = os.path.join(
-                settings.UPLOAD_DIR,
-                f"journal_{task_id}.pdf"
-            )
-
-            result_path = await journal_builder.build_journal(
-                db,
-                task,
-                list(articles),
-                templates,
-                journal_settings,
-                output_path
-            )
-
-            # Update task
-            task.status = "done"
-            task.result_path = result_path
-            task.progress = 100
-            await db.commit()
-
-        except Exception as e:
-            task.status = "error"
-            task.error_message = str(e)
-            await db.commit()
-
-
 @router.post("/", response_model=GenerationResponse)
 async def start_generation(
     request: GenerationRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -126,14 +61,23 @@ async def start_generation(
     await db.commit()
     await db.refresh(task)
 
-    # Start background task
-    background_tasks.add_task(
-        generate_journal_task,
-        task.id,
-        [str(aid) for aid in request.article_ids],
-        request.templates,
-        request.settings.dict()
-    )
+    # Hand the build over to the worker queue
+    try:
+        async_result = await asyncio.to_thread(
+            generate_journal.delay,
+            str(task.id),
+            [str(aid) for aid in request.article_ids],
+            request.templates,
+            request.settings.dict()
+        )
+    except Exception as e:
+        task.status = "error"
+        task.error_message = f"Очередь генерации недоступна: {str(e)}"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Generation queue unavailable")
+
+    task.celery_task_id = async_result.id
+    await db.commit()
 
     return GenerationResponse(task_id=task.id)
 
@@ -162,9 +106,63 @@ async def get_generation_status(
     )
 
 
+@router.get("/{task_id}/events")
+async def stream_generation_status(
+    task_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream generation progress as Server-Sent Events.
+
+    The first event is the current state from the DB, the following ones are
+    pushed by the build as they happen. The stream ends on 'done' or 'error'.
+    """
+    # Subscribe before reading the snapshot so no event falls in between
+    subscription = await progress_bus.subscribe(generation_channel(task_id))
+
+    try:
+        result = await db.execute(
+            select(GenerationTask).where(GenerationTask.id == uuid.UUID(task_id))
+        )
+        task = result.scalar_one_or_none()
+    except Exception:
+        await subscription.close()
+        raise
+
+    if not task:
+        await subscription.close()
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    snapshot = generation_event(task)
+
+    async def event_stream():
+        try:
+            event = snapshot
+            while True:
+                if event is None:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+                    if event["status"] in ("done", "error"):
+                        break
+                event = await subscription.get(timeout=15)
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{task_id}/download")
 async def download_journal(
     task_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -184,9 +182,10 @@ async def download_journal(
     if not task.result_path or not os.path.exists(task.result_path):
         raise HTTPException(status_code=404, detail="Generated file not found")
 
-    return FileResponse(
+    return pdf_file_response(
+        request,
         task.result_path,
-        media_type="application/pdf",
+        file_hash=task.result_hash,
         filename=f"journal_{task_id}.pdf"
     )
 
@@ -199,25 +198,34 @@ async def preview_structure(
     """
     Preview journal structure without generating.
     """
-    # Get articles
+    # Get articles; stored statistics are enough, the text head is not needed
     result = await db.execute(
-        select(Article).where(Article.id.in_(request.article_ids))
+        select(Article)
+        .options(defer(Article.text_head))
+        .where(Article.id.in_(request.article_ids))
     )
     articles = list(result.scalars().all())
 
     # Sort articles
     articles.sort(key=lambda a: a.sort_order or 0)
 
-    # Get templates
-    templates = {}
-    for key, template_id in request.templates.items():
-        if template_id:
-            result = await db.execute(
-                select(Template).where(Template.id == uuid.UUID(str(template_id)))
-            )
-            templates[key] = result.scalar_one_or_none()
-        else:
-            templates[key] = None
+    # Get templates in one query ('title_id' -> 'title')
+    template_ids = {
+        key.removesuffix('_id'): uuid.UUID(str(template_id))
+        for key, template_id in request.templates.items()
+        if template_id
+    }
+    templates_by_id = {}
+    if template_ids:
+        result = await db.execute(
+            select(Template).where(Template.id.in_(template_ids.values()))
+        )
+        templates_by_id = {template.id: template for template in result.scalars().all()}
+    templates = {
+        key.removesuffix('_id'): None for key in request.templates
+    }
+    for key, template_id in template_ids.items():
+        templates[key] = templates_by_id.get(template_id)
 
     # Generate preview
     preview = await journal_builder.preview_structure(
@@ -1,21 +1,25 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 import os
 import uuid
-from typing import Optional
+import shutil
+import asyncio
+from typing import List, Optional
 
 from app.db.database import get_db
 from app.db.models import Session as DBSession, Article, Template
-from app.models.article import ArticleResponse
+from app.models.article import ArticleResponse, BatchUploadItem, BatchUploadResponse
+from app.models.journal import JournalSettings
 from app.services.docx_parser import DocxParser
-from app.services.ai_extractor import AIExtractor
 from app.services.pdf_generator import PDFGenerator
+from app.services.metadata_worker import metadata_worker
+from app.services.preconversion_worker import preconversion_worker
+from app.services.upload_storage import StoredUpload, UploadTooLargeError, save_upload
 from app.core.config import settings
 
 router = APIRouter()
 docx_parser = DocxParser()
-ai_extractor = AIExtractor()
 pdf_generator = PDFGenerator()
 
 
@@ -26,36 +30,25 @@ async def upload_article(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Upload article file (.docx) and extract metadata using AI.
+    Upload article file (.docx).
+
+    Returns as soon as the file is stored; the article is created with
+    metadata_status 'pending' and its metadata is extracted in the
+    background. Updates are streamed by /api/articles/events.
     """
     # Validate file type
     if not file.filename.endswith('.docx'):
         raise HTTPException(status_code=400, detail="Only .docx files are allowed")
 
-    # Check file size
-    contents = await file.read()
-    if len(contents) > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+    # Check file size; enforced again while streaming it to disk
+    if _too_large(file):
         raise HTTPException(status_code=400, detail=f"File too large (max {settings.MAX_FILE_SIZE_MB}MB)")
 
     # Get or create session
-    if session_id:
-        result = await db.execute(
-            select(DBSession).where(DBSession.id == uuid.UUID(session_id))
-        )
-        session_obj = result.scalar_one_or_none()
-        if not session_obj:
-            raise HTTPException(status_code=404, detail="Session not found")
-    else:
-        session_obj = DBSession()
-        db.add(session_obj)
-        await db.commit()
-        await db.refresh(session_obj)
+    session_obj = await _get_or_create_session(db, session_id)
 
     # Check article limit
-    result = await db.execute(
-        select(Article).where(Article.session_id == session_obj.id)
-    )
-    article_count = len(result.scalars().all())
+    article_count = await _count_articles(db, session_obj.id)
     if article_count >= settings.MAX_ARTICLES_PER_SESSION:
         raise HTTPException(
             status_code=400,
@@ -65,44 +58,114 @@ async def upload_article(
     # Save file
     file_id = uuid.uuid4()
     file_path = os.path.join(settings.UPLOAD_DIR, f"{file_id}.docx")
-    with open(file_path, 'wb') as f:
-        f.write(contents)
-
-    # Validate DOCX
-    if not docx_parser.validate_docx(file_path):
-        os.remove(file_path)
+    try:
+        stored = await _store_docx(file, file_path)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if stored is None:
         raise HTTPException(status_code=400, detail="Invalid DOCX file")
 
-    # Extract text for AI processing
     try:
-        text = docx_parser.extract_text(file_path, max_chars=2000)
-
-        # Extract metadata using AI
-        metadata = await ai_extractor.extract_metadata(text)
-
-        # Create article record
         article = Article(
             session_id=session_obj.id,
             filename=file.filename,
-            title=metadata.title,
-            author=metadata.author,
-            language=metadata.language,
             file_path=file_path,
-            ai_confidence=metadata.confidence
+            file_hash=stored.sha256,
+            metadata_status="pending"
         )
 
         db.add(article)
         await db.commit()
         await db.refresh(article)
-
-        return article
-
     except Exception as e:
         # Cleanup on error
         if os.path.exists(file_path):
             os.remove(file_path)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+    metadata_worker.enqueue(article.id)
+    preconversion_worker.enqueue(article.id)
+    return article
+
+
+@router.post("/articles", response_model=BatchUploadResponse)
+async def upload_articles(
+    files: List[UploadFile] = File(...),
+    session_id: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload several article files (.docx) at once.
+
+    Files are stored concurrently and all articles are inserted in one
+    transaction with metadata_status 'pending'; metadata is extracted in the
+    background. Per-file results and errors are returned together.
+    """
+    session_obj = await _get_or_create_session(db, session_id)
+    free_slots = settings.MAX_ARTICLES_PER_SESSION - await _count_articles(db, session_obj.id)
+
+    results: List[BatchUploadItem] = [BatchUploadItem(filename=f.filename) for f in files]
+    accepted = []  # (result index, upload, file path)
+
+    for index, file in enumerate(files):
+        if not file.filename.endswith('.docx'):
+            results[index].error = "Only .docx files are allowed"
+            continue
+        if len(accepted) >= free_slots:
+            results[index].error = f"Maximum {settings.MAX_ARTICLES_PER_SESSION} articles per session"
+            continue
+        if _too_large(file):
+            results[index].error = f"File too large (max {settings.MAX_FILE_SIZE_MB}MB)"
+            continue
+
+        file_path = os.path.join(settings.UPLOAD_DIR, f"{uuid.uuid4()}.docx")
+        accepted.append((index, file, file_path))
+
+    # Store concurrently
+    stored_list = await asyncio.gather(
+        *[_store_docx(file, file_path) for _, file, file_path in accepted],
+        return_exceptions=True
+    )
+
+    saved = []  # (result index, stored upload)
+    for (index, _, _), stored in zip(accepted, stored_list):
+        if isinstance(stored, UploadTooLargeError):
+            results[index].error = str(stored)
+        elif isinstance(stored, Exception):
+            results[index].error = f"Error saving file: {str(stored)}"
+        elif stored is None:
+            results[index].error = "Invalid DOCX file"
+        else:
+            saved.append((index, stored))
+
+    try:
+        articles = []
+        for index, stored in saved:
+            article = Article(
+                session_id=session_obj.id,
+                filename=results[index].filename,
+                file_path=stored.path,
+                file_hash=stored.sha256,
+                metadata_status="pending"
+            )
+            db.add(article)
+            articles.append((index, article))
+
+        await db.commit()
+    except Exception as e:
+        # Cleanup on error
+        for _, stored in saved:
+            if os.path.exists(stored.path):
+                os.remove(stored.path)
+        raise HTTPException(status_code=500, detail=f"Error processing files: {str(e)}")
+
+    for index, article in articles:
+        metadata_worker.enqueue(article.id)
+        preconversion_worker.enqueue(article.id)
+        results[index].article = ArticleResponse.model_validate(article)
+
+    return BatchUploadResponse(session_id=session_obj.id, results=results)
+
 
 @router.post("/template")
 async def upload_template(
@@ -135,25 +198,29 @@ async def upload_template(
     file_ext = '.pdf' if file.filename.endswith('.pdf') else '.docx'
     file_path = os.path.join(settings.UPLOAD_DIR, f"template_{file_id}{file_ext}")
 
-    contents = await file.read()
-    with open(file_path, 'wb') as f:
-        f.write(contents)
+    try:
+        stored = await save_upload(file, file_path)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Convert DOCX to PDF if needed
+    # Convert DOCX to PDF if needed; the same template re-uploaded for the
+    # next issue is served from the conversion cache
+    pages = None
     if file_ext == '.docx':
         pdf_path = file_path.replace('.docx', '.pdf')
         try:
-            pdf_generator.docx_to_pdf(file_path, pdf_path)
+            pages = await asyncio.to_thread(_convert_template, file_path, pdf_path, stored.sha256)
             file_path = pdf_path
         except Exception as e:
             os.remove(file_path)
             raise HTTPException(status_code=500, detail=f"Error converting to PDF: {str(e)}")
 
     # Get page count
-    try:
-        pages = pdf_generator.get_pdf_page_count(file_path)
-    except Exception:
-        pages = 1
+    if pages is None:
+        try:
+            pages = await asyncio.to_thread(pdf_generator.get_pdf_page_count, file_path)
+        except Exception:
+            pages = 1
 
     # Create or update template record
     result = await db.execute(
@@ -170,6 +237,7 @@ async def upload_template(
             os.remove(template.file_path)
         template.filename = file.filename
         template.file_path = file_path
+        template.file_hash = stored.sha256
         template.pages = pages
     else:
         template = Template(
@@ -177,6 +245,7 @@ async def upload_template(
             type=template_type,
             filename=file.filename,
             file_path=file_path,
+            file_hash=stored.sha256,
             pages=pages
         )
         db.add(template)
@@ -190,3 +259,52 @@ async def upload_template(
         "pages": template.pages,
         "type": template.type
     }
+
+
+async def _get_or_create_session(db: AsyncSession, session_id: Optional[str]) -> DBSession:
+    """Get existing session or create a new one."""
+    if session_id:
+        result = await db.execute(
+            select(DBSession).where(DBSession.id == uuid.UUID(session_id))
+        )
+        session_obj = result.scalar_one_or_none()
+        if not session_obj:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session_obj
+
+    session_obj = DBSession()
+    db.add(session_obj)
+    await db.commit()
+    await db.refresh(session_obj)
+    return session_obj
+
+
+async def _count_articles(db: AsyncSession, session_id: uuid.UUID) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(Article).where(Article.session_id == session_id)
+    )
+    return result.scalar_one()
+
+
+def _convert_template(docx_path: str, pdf_path: str, content_hash: str) -> int:
+    """Convert template through the conversion cache; returns page count."""
+    cached_pdf, pages = pdf_generator.docx_to_pdf_cached(
+        docx_path, JournalSettings.default_format_fingerprint(), content_hash
+    )
+    # Templates are used as-is by builds, keep a copy the cache cannot evict
+    shutil.copyfile(cached_pdf, pdf_path)
+    return pages
+
+
+def _too_large(file: UploadFile) -> bool:
+    """Size check for uploads whose size the multipart parser already knows."""
+    return file.size is not None and file.size > settings.MAX_FILE_SIZE_MB * 1024 * 1024
+
+
+async def _store_docx(file: UploadFile, file_path: str) -> Optional[StoredUpload]:
+    """Stream uploaded DOCX to disk; removes it and returns None if it is not a DOCX package."""
+    stored = await save_upload(file, file_path)
+    if not await asyncio.to_thread(docx_parser.is_docx_package, file_path):
+        os.remove(file_path)
+        return None
+    return stored
@@ -10,6 +10,22 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Generation queue (Celery). Broker defaults to REDIS_URL; use "memory://"
+    # with CELERY_TASK_ALWAYS_EAGER=True to run builds in-process in tests
+    CELERY_BROKER_URL: Optional[str] = None
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    GENERATION_CONCURRENCY: int = 2
+    GENERATION_SOFT_TIME_LIMIT: int = 1740
+    GENERATION_TIME_LIMIT: int = 1800
+    GENERATION_MAX_ATTEMPTS: int = 3
+    GENERATION_SWEEP_INTERVAL: int = 300
+
+    # Progress events: "redis" (pub/sub across processes) or "memory" (in-process)
+    PROGRESS_BUS_BACKEND: str = "redis"
+    # Generation progress is persisted to the DB every N percent or every M seconds
+    PROGRESS_CHECKPOINT_STEP: int = 25
+    PROGRESS_FLUSH_INTERVAL: float = 5.0
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Railway provides DATABASE_URL as postgresql://, convert to postgresql+asyncpg://
@@ -29,13 +45,62 @@ class Settings(BaseSettings):
     # AI
     OPENROUTER_API_KEY: Optional[str] = None
     AI_MODEL: str = "deepseek/deepseek-chat"
+    AI_TIMEOUT: float = 30.0
+    AI_CONNECT_TIMEOUT: float = 5.0
+    AI_MAX_CONNECTIONS: int = 20
+    AI_KEEPALIVE_EXPIRY: float = 60.0
+    AI_BATCH_SIZE: int = 8
+
+    # AI request scheduling
+    AI_MAX_CONCURRENCY: int = 4
+    AI_RATE_LIMIT_PER_MINUTE: float = 60
+    AI_RATE_BURST: int = 10
+    AI_MAX_RETRIES: int = 3
+    AI_RETRY_BASE_DELAY: float = 1.0
+    AI_RETRY_MAX_DELAY: float = 30.0
+
+    # Extracted metadata cache: "redis" (memory front + Redis) or "memory"
+    METADATA_CACHE_BACKEND: str = "redis"
+    METADATA_CACHE_TTL_HOURS: int = 720
+    METADATA_CACHE_MEMORY_ENTRIES: int = 1000
+    METADATA_CACHE_REDIS_ENTRIES: int = 50000
+
+    # Local metadata extraction; AI is asked only below this confidence
+    HEURISTIC_CONFIDENCE_THRESHOLD: float = 0.8
+
+    # Background metadata extraction of uploaded articles
+    METADATA_WORKERS: int = 2
+
+    # Background DOCX → PDF conversion of uploaded articles
+    PRECONVERT_ENABLED: bool = True
+    PRECONVERT_QUEUE_SIZE: int = 500
 
     # App
     SESSION_TTL_HOURS: int = 24
     MAX_FILE_SIZE_MB: int = 50
+    UPLOAD_CHUNK_SIZE_KB: int = 1024
+    DOCX_PARSE_CACHE_ENTRIES: int = 128
     MAX_ARTICLES_PER_SESSION: int = 100
     UPLOAD_DIR: str = "./uploads"
 
+    # LibreOffice conversion pool
+    LIBREOFFICE_BINARY: str = "libreoffice"
+    # Interpreter with the UNO bindings (python3-uno) that drives resident soffice
+    LIBREOFFICE_PYTHON: Optional[str] = "/usr/bin/python3"
+    LIBREOFFICE_POOL_SIZE: int = min(os.cpu_count() or 1, 4)
+    LIBREOFFICE_MAX_CONVERSIONS: int = 100
+    LIBREOFFICE_TIMEOUT: int = 60
+    LIBREOFFICE_PROFILE_DIR: Optional[str] = None
+    CONVERSION_CACHE_MAX_MB: int = 2048
+
+    # Unicode TTF fonts for generated pages (table of contents)
+    PDF_FONT_PATH: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    PDF_FONT_BOLD_PATH: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+    # Linearize and compress finished journals (qpdf CLI or pikepdf)
+    PDF_OPTIMIZE: bool = True
+    QPDF_BINARY: str = "qpdf"
+
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
 
@@ -32,8 +32,18 @@ class Article(Base):
     language = Column(String(10))  # 'latin' | 'cyrillic'
     sort_order = Column(Integer)
     file_path = Column(String(500))
+    file_hash = Column(String(64))  # SHA-256 of the uploaded file
     created_at = Column(DateTime, default=datetime.utcnow)
     ai_confidence = Column(Float)
+    metadata_status = Column(String(20), default="pending")  # 'pending' | 'ready' | 'error'
+
+    # Document statistics, filled at ingest
+    word_count = Column(Integer)
+    char_count = Column(Integer)
+    image_count = Column(Integer)
+    page_count = Column(Integer)  # pages of the converted PDF, once converted
+    pdf_path = Column(String(500))  # converted PDF in the conversion cache
+    text_head = Column(Text)
 
     # Relationships
     session = relationship("Session", back_populates="articles")
@@ -47,6 +57,7 @@ class Template(Base):
     type = Column(String(20), nullable=False)  # 'title' | 'intro' | 'outro'
     filename = Column(String(255))
     file_path = Column(String(500))
+    file_hash = Column(String(64))  # SHA-256 of the uploaded file
     pages = Column(Integer)
 
     # Relationships
@@ -64,6 +75,7 @@ class Archive(Base):
     pages = Column(Integer)
     articles_count = Column(Integer)
     file_size = Column(BigInteger)
+    file_hash = Column(String(64))  # SHA-256 of the PDF, ETag of downloads
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
@@ -76,8 +88,13 @@ class GenerationTask(Base):
     progress = Column(Integer, default=0)
     current_step = Column(String(100))
     result_path = Column(String(500))
+    result_hash = Column(String(64))  # SHA-256 of the result, ETag of downloads
     error_message = Column(Text)
+    celery_task_id = Column(String(50))
+    attempts = Column(Integer, default=0)
+    manifest = Column(Text)  # JSON BuildManifest of the result
     created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
     completed_at = Column(DateTime)
 
     # Relationships
@@ -9,6 +9,16 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.db.database import get_engine, AsyncSessionLocal
 from app.api.routes import upload, articles, generate, archive
+from app.services.libreoffice_pool import libreoffice_pool
+from app.services.ai_client import ai_http_client
+from app.services.conversion_cache import conversion_cache
+from app.services.metadata_cache import metadata_cache
+from app.services.ai_scheduler import ai_scheduler
+from app.services.metadata_worker import metadata_worker
+from app.services.preconversion_worker import preconversion_worker
+from app.services.docx_parser import parsed_document_cache
+from app.services.pdf_optimizer import pdf_optimizer
+from app.services.generation_sweeper import generation_sweeper
 
 # Логирование
 logging.basicConfig(level=logging.INFO)
@@ -35,15 +45,29 @@ async def lifespan(app: FastAPI):
         logger.warning("Приложение продолжит работу с ограниченным функционалом")
         # Не падаем - позволяем приложению запуститься
 
+    await ai_http_client.start()
+    if app.state.db_available:
+        await metadata_worker.start()
+        await generation_sweeper.start()
+        if settings.PRECONVERT_ENABLED:
+            await preconversion_worker.start()
+
     yield
 
     logger.info("Остановка — закрываем соединения...")
+    await metadata_worker.stop()
+    await generation_sweeper.stop()
+    await preconversion_worker.stop()
     if app.state.engine:
         try:
             await app.state.engine.dispose()
         except Exception as e:
             logger.error(f"Ошибка при закрытии БД: {e}")
 
+    await ai_http_client.aclose()
+    await metadata_cache.aclose()
+    libreoffice_pool.shutdown()
+
 app = FastAPI(
     title="AI Journal Editor",
     description="AI-powered journal editor",
@@ -92,3 +116,18 @@ async def health():
         "database": db_status,
         "message": "Service is running" + (" (database unavailable)" if db_status != "connected" else "")
     }
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime counters of shared services"""
+    return {
+        "ai_client": ai_http_client.stats(),
+        "ai_scheduler": ai_scheduler.stats(),
+        "conversion_cache": conversion_cache.stats(),
+        "generation_sweeper": generation_sweeper.stats(),
+        "docx_parse_cache": parsed_document_cache.stats(),
+        "metadata_cache": metadata_cache.stats(),
+        "metadata_worker": metadata_worker.stats(),
+        "pdf_optimizer": pdf_optimizer.stats(),
+        "preconversion_worker": preconversion_worker.stats(),
+    }
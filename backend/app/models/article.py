@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -27,6 +27,9 @@ class ArticleResponse(ArticleBase):
     sort_order: Optional[int] = None
     created_at: datetime
     ai_confidence: Optional[float] = None
+    metadata_status: Optional[str] = None  # 'pending' | 'ready' | 'error'
+    word_count: Optional[int] = None
+    page_count: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -37,3 +40,14 @@ class ArticleMetadata(BaseModel):
     author: str
     language: str  # 'latin' | 'cyrillic'
     confidence: float = Field(ge=0.0, le=1.0)
+
+
+class BatchUploadItem(BaseModel):
+    filename: str
+    article: Optional[ArticleResponse] = None
+    error: Optional[str] = None
+
+
+class BatchUploadResponse(BaseModel):
+    session_id: UUID
+    results: List[BatchUploadItem]
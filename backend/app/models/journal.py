@@ -10,6 +10,16 @@ class JournalSettings(BaseModel):
     year: int
     month: int = Field(ge=1, le=12)
 
+    def format_fingerprint(self) -> str:
+        """Fingerprint of the page format, part of the conversion cache key."""
+        margins = ",".join(f"{k}={v}" for k, v in sorted(self.margins.items()))
+        return f"{self.page_format}|{margins}"
+
+    @classmethod
+    def default_format_fingerprint(cls) -> str:
+        """Fingerprint of the default page format, for conversions done before a build."""
+        return cls.model_construct(year=0, month=1).format_fingerprint()
+
 
 class GenerationRequest(BaseModel):
     settings: JournalSettings
@@ -0,0 +1,93 @@
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AIHttpClient:
+    """
+    Shared keep-alive HTTP client for the AI API.
+
+    One pooled ``httpx.AsyncClient`` lives for the whole application
+    lifespan, so requests reuse TCP/TLS connections instead of paying a
+    handshake each time. Also keeps basic request metrics.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=1000)
+
+    async def start(self):
+        """Open the connection pool."""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.AI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_MAX_CONNECTIONS,
+                keepalive_expiry=settings.AI_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.AI_TIMEOUT, connect=settings.AI_CONNECT_TIMEOUT),
+        )
+
+    async def aclose(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send POST request through the shared pool.
+
+        The pool is opened lazily when used outside the application lifespan
+        (scripts, workers).
+        """
+        if self._client is None:
+            await self.start()
+
+        self.in_flight += 1
+        self.requests += 1
+        started = time.perf_counter()
+        try:
+            return await self._client.post(url, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._latencies.append(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, float]:
+        latencies = sorted(self._latencies)
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "http2": HTTP2_AVAILABLE,
+            "latency_p50_ms": self._percentile(latencies, 0.5),
+            "latency_p95_ms": self._percentile(latencies, 0.95),
+        }
+
+    @staticmethod
+    def _percentile(values: list, fraction: float) -> float:
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, int(len(values) * fraction))
+        return round(values[index] * 1000, 1)
+
+
+ai_http_client = AIHttpClient()
@@ -1,8 +1,19 @@
-import httpx
 import json
-from typing import Dict, Optional
+import asyncio
+from typing import Dict, List, Optional
 from app.core.config import settings
 from app.models.article import ArticleMetadata
+from app.services.ai_client import ai_http_client
+from app.services.metadata_cache import metadata_cache
+from app.services.ai_scheduler import ai_scheduler, Priority
+
+# Bump when the extraction prompt changes so cached results are not reused
+PROMPT_VERSION = "1"
+
+SYSTEM_PROMPT = """Ты — AI-ассистент редактора журнала.
+Извлекай метаданные из научных статей.
+НЕ изменяй и НЕ редактируй текст статьи.
+Отвечай строго в формате JSON."""
 
 
 class AIExtractor:
@@ -13,20 +24,26 @@ class AIExtractor:
         self.model = settings.AI_MODEL
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
 
-    async def extract_metadata(self, article_text: str) -> ArticleMetadata:
+    async def extract_metadata(
+        self,
+        article_text: str,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> ArticleMetadata:
         """
         Extract title, author, and language from article text using AI.
 
         Args:
             article_text: Text from the beginning of the article
+            priority: Scheduling priority of the AI request
 
         Returns:
             ArticleMetadata with extracted information
         """
-        system_prompt = """Ты — AI-ассистент редактора журнала.
-Извлекай метаданные из научных статей.
-НЕ изменяй и НЕ редактируй текст статьи.
-Отвечай строго в формате JSON."""
+        text_prefix = article_text[:2000]
+        cache_key = metadata_cache.make_key(text_prefix, self.model, PROMPT_VERSION)
+        cached = await metadata_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         user_prompt = f"""Извлеки из начала статьи:
 1. Название статьи
@@ -34,7 +51,7 @@ class AIExtractor:
 3. Определи, на каком алфавите написана фамилия автора: latin (латиница A-Z) или cyrillic (кириллица А-Я)
 
 Текст начала статьи:
-{article_text[:2000]}
+{text_prefix}
 
 Ответь строго JSON:
 {{
@@ -45,19 +62,124 @@ class AIExtractor:
 }}"""
 
         try:
-            result = await self._request(user_prompt, system_prompt)
-            data = json.loads(result)
-
-            return ArticleMetadata(
-                title=data.get("title", "Untitled"),
-                author=data.get("author", "Unknown Author"),
-                language=data.get("language", "latin"),
-                confidence=data.get("confidence", 0.5)
-            )
+            result = await self._request(user_prompt, SYSTEM_PROMPT, priority)
+            metadata = self._metadata_from_dict(json.loads(result))
         except Exception as e:
             # Fallback to simple extraction
+            ai_scheduler.record_fallback()
             return self._fallback_extraction(article_text)
 
+        # Fallback results are not cached: the next upload retries the AI
+        await metadata_cache.set(cache_key, metadata)
+        return metadata
+
+    async def extract_metadata_batch(
+        self,
+        article_texts: List[str],
+        priority: Priority = Priority.INTERACTIVE
+    ) -> List[ArticleMetadata]:
+        """
+        Extract metadata for several articles, several articles per AI request.
+
+        Cached articles are answered from the cache; the rest are grouped
+        into prompts of AI_BATCH_SIZE articles that return a JSON array.
+        Articles the AI could not answer fall back to simple extraction.
+
+        Args:
+            article_texts: Texts from the beginning of each article
+            priority: Scheduling priority of the AI requests
+
+        Returns:
+            ArticleMetadata for each article, in the same order
+        """
+        results: List[Optional[ArticleMetadata]] = [None] * len(article_texts)
+        prefixes = [text[:2000] for text in article_texts]
+        keys = [
+            metadata_cache.make_key(prefix, self.model, PROMPT_VERSION)
+            for prefix in prefixes
+        ]
+
+        pending = []
+        for index, key in enumerate(keys):
+            results[index] = await metadata_cache.get(key)
+            if results[index] is None:
+                pending.append(index)
+
+        batch_size = max(1, settings.AI_BATCH_SIZE)
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        answers = await asyncio.gather(
+            *[self._request_batch([prefixes[i] for i in batch], priority) for batch in batches]
+        )
+
+        for batch, batch_answers in zip(batches, answers):
+            for index, metadata in zip(batch, batch_answers):
+                if metadata is None:
+                    ai_scheduler.record_fallback()
+                    results[index] = self._fallback_extraction(article_texts[index])
+                else:
+                    results[index] = metadata
+                    await metadata_cache.set(keys[index], metadata)
+
+        return results
+
+    async def _request_batch(
+        self,
+        text_prefixes: List[str],
+        priority: Priority
+    ) -> List[Optional[ArticleMetadata]]:
+        """
+        Extract metadata for a group of articles with a single prompt.
+
+        Returns:
+            ArticleMetadata per article, None where the answer was unusable
+        """
+        articles_block = "\n\n".join(
+            f"### Статья {number}\n{prefix}"
+            for number, prefix in enumerate(text_prefixes, start=1)
+        )
+        user_prompt = f"""Ниже начала {len(text_prefixes)} статей. Для каждой статьи извлеки:
+1. Название статьи
+2. ФИО автора (или авторов)
+3. Определи, на каком алфавите написана фамилия автора: latin (латиница A-Z) или cyrillic (кириллица А-Я)
+
+{articles_block}
+
+Ответь строго JSON-массивом, по одному объекту на статью, в том же порядке:
+[
+  {{
+    "index": номер статьи,
+    "title": "название статьи",
+    "author": "Фамилия И.О.",
+    "language": "latin" или "cyrillic",
+    "confidence": 0.0-1.0
+  }}
+]"""
+
+        answers: List[Optional[ArticleMetadata]] = [None] * len(text_prefixes)
+        try:
+            result = await self._request(user_prompt, SYSTEM_PROMPT, priority)
+            # Models often wrap arrays in a markdown code fence
+            result = result.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+            items = json.loads(result)
+        except Exception:
+            return answers
+
+        if not isinstance(items, list):
+            return answers
+
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index", position + 1)
+            if not isinstance(index, int) or not 1 <= index <= len(text_prefixes):
+                continue
+            try:
+                answers[index - 1] = self._metadata_from_dict(item)
+            except Exception:
+                continue
+
+        return answers
+
     async def detect_language(self, author_name: str) -> str:
         """
         Detect language (latin/cyrillic) from author name.
@@ -89,13 +211,19 @@ class AIExtractor:
         except Exception:
             return "latin"
 
-    async def _request(self, prompt: str, system: str = "") -> str:
+    async def _request(
+        self,
+        prompt: str,
+        system: str = "",
+        priority: Priority = Priority.INTERACTIVE
+    ) -> str:
         """
-        Make request to OpenRouter API.
+        Make request to OpenRouter API through the request scheduler.
 
         Args:
             prompt: User prompt
             system: System prompt
+            priority: Scheduling priority
 
         Returns:
             AI response text
@@ -118,15 +246,21 @@ class AIExtractor:
             "messages": messages,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                self.base_url,
-                headers=headers,
-                json=data
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+        response = await ai_scheduler.run(
+            lambda: ai_http_client.post(self.base_url, headers=headers, json=data),
+            priority
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
+
+    def _metadata_from_dict(self, data: dict) -> ArticleMetadata:
+        return ArticleMetadata(
+            title=data.get("title", "Untitled"),
+            author=data.get("author", "Unknown Author"),
+            language=data.get("language", "latin"),
+            confidence=data.get("confidence", 0.5)
+        )
 
     def _fallback_extraction(self, article_text: str) -> ArticleMetadata:
         """
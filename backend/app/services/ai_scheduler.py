@@ -0,0 +1,180 @@
+import time
+import heapq
+import random
+import asyncio
+import itertools
+from enum import IntEnum
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class Priority(IntEnum):
+    """AI request priority, lower runs first."""
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+class AIRequestScheduler:
+    """
+    Gatekeeper in front of the AI client.
+
+    Limits concurrent requests with a priority-ordered semaphore, paces them
+    with a token bucket and retries rate-limited or failed requests with
+    exponential backoff and jitter, honouring ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate_per_minute: float,
+        burst: int,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_per_second = rate_per_minute / 60
+        self.burst = max(1, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.queued = 0
+        self.in_flight = 0
+        self.retried = 0
+        self.fallbacks = 0
+
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+
+    async def run(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        priority: Priority = Priority.INTERACTIVE
+    ) -> httpx.Response:
+        """
+        Send request through the scheduler.
+
+        Args:
+            send: Coroutine factory performing one HTTP attempt
+            priority: Request priority
+
+        Returns:
+            Last response; retryable statuses are returned once retries run out
+        """
+        attempt = 0
+        while True:
+            await self._acquire(priority)
+            try:
+                await self._take_token()
+                response = await send()
+                error = None
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                response = None
+                error = e
+            finally:
+                self._release()
+
+            retryable = error is not None or response.status_code in RETRY_STATUS_CODES
+            if not retryable:
+                return response
+            if attempt >= self.max_retries:
+                if error is not None:
+                    raise error
+                return response
+
+            attempt += 1
+            self.retried += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+    def record_fallback(self):
+        """Count a request that ended in local fallback extraction."""
+        self.fallbacks += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "retried": self.retried,
+            "fallback": self.fallbacks,
+        }
+
+    async def _acquire(self, priority: Priority):
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        self.queued += 1
+        try:
+            # _release hands its slot over, in_flight is already counted
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        finally:
+            self.queued -= 1
+
+    def _release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def _take_token(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._refilled_at) * self.rate_per_second
+            )
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = self._retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # Full jitter keeps retrying clients from hitting the API in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+ai_scheduler = AIRequestScheduler(
+    max_concurrency=settings.AI_MAX_CONCURRENCY,
+    rate_per_minute=settings.AI_RATE_LIMIT_PER_MINUTE,
+    burst=settings.AI_RATE_BURST,
+    max_retries=settings.AI_MAX_RETRIES,
+    base_delay=settings.AI_RETRY_BASE_DELAY,
+    max_delay=settings.AI_RETRY_MAX_DELAY
+)
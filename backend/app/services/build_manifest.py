@@ -0,0 +1,72 @@
+import os
+import json
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.services.pdf_generator import ReusedPages
+
+MANIFEST_VERSION = 1
+
+
+class ManifestPart(NamedTuple):
+    kind: str  # 'title' | 'intro' | 'indent' | 'article' | 'toc' | 'outro'
+    hash: str  # identifies the part's pages before numbering
+    pages: int
+    offset: int  # zero-based index of the first page in the output PDF
+
+
+class BuildManifest:
+    """
+    Description of an assembled journal, stored with its GenerationTask.
+
+    Lists every part of the output with a content hash, page count and page
+    offset. A later build of the same session looks parts up by hash: the
+    page count of a known part is taken from here, and a part with the same
+    hash at the same offset has identical, already numbered pages in the
+    previous output, which are copied instead of being rebuilt.
+
+    Reuse needs the previous output file: once it is deleted (by cleanup
+    or by hand) the next build converts every part again.
+    """
+
+    def __init__(self, output_path: str, parts: List[ManifestPart]):
+        self.output_path = output_path
+        self.parts = parts
+        self._by_hash: Dict[str, ManifestPart] = {part.hash: part for part in parts}
+        self._by_position: Dict[Tuple[str, int], ManifestPart] = {
+            (part.hash, part.offset): part for part in parts
+        }
+
+    @classmethod
+    def from_json(cls, raw: Optional[str]) -> Optional["BuildManifest"]:
+        """Load manifest; None if missing or written by another version."""
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            if data.get("version") != MANIFEST_VERSION:
+                return None
+            parts = [ManifestPart(**part) for part in data["parts"]]
+            return cls(data["output_path"], parts)
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": MANIFEST_VERSION,
+            "output_path": self.output_path,
+            "parts": [part._asdict() for part in self.parts],
+        })
+
+    def page_count(self, part_hash: str) -> Optional[int]:
+        """Page count of a part seen in this build."""
+        part = self._by_hash.get(part_hash)
+        return part.pages if part is not None else None
+
+    def reusable(self, part: ManifestPart) -> Optional[ReusedPages]:
+        """Pages of the previous output that can stand in for part, if any."""
+        previous = self._by_position.get((part.hash, part.offset))
+        if previous is None or previous.pages != part.pages:
+            return None
+        if not os.path.exists(self.output_path):
+            return None
+        return ReusedPages(self.output_path, previous.offset, previous.pages)
@@ -0,0 +1,145 @@
+import os
+import json
+import uuid
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# Bump whenever the conversion pipeline changes in a way that affects output
+CONVERTER_VERSION = "libreoffice-pool-1"
+
+
+class ConversionCache:
+    """
+    Content-addressed cache of DOCX → PDF conversions.
+
+    Entries are keyed by the SHA-256 of the DOCX bytes, the converter version
+    and a page-format fingerprint. Every entry is a ``<key>.pdf`` file plus a
+    ``<key>.json`` sidecar with its page count; file mtime serves as the LRU
+    clock, so several processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(docx_path: str, fingerprint: str = "", content_hash: Optional[str] = None) -> str:
+        """
+        Compute cache key for a DOCX file.
+
+        Args:
+            docx_path: Path to DOCX file
+            fingerprint: Page-format fingerprint of the build
+            content_hash: Known hex SHA-256 of the file; saves reading it
+
+        Returns:
+            Hex digest identifying the conversion
+        """
+        if content_hash is None:
+            file_digest = hashlib.sha256()
+            with open(docx_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    file_digest.update(chunk)
+            content_hash = file_digest.hexdigest()
+
+        digest = hashlib.sha256()
+        for part in (content_hash, CONVERTER_VERSION, fingerprint):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """
+        Look up a conversion.
+
+        Returns:
+            (pdf_path, page_count) or None on miss
+        """
+        pdf_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                pages = json.load(f)['pages']
+            os.utime(pdf_path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return pdf_path, pages
+
+    def put(self, key: str, pdf_path: str, pages: int) -> str:
+        """
+        Move a freshly converted PDF into the cache.
+
+        Args:
+            key: Cache key from make_key
+            pdf_path: Converted PDF (moved, not copied)
+            pages: Page count of the PDF
+
+        Returns:
+            Path of the cached PDF
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached_pdf, meta_path = self._paths(key)
+        os.replace(pdf_path, cached_pdf)
+
+        tmp_meta = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_meta, 'w') as f:
+            json.dump({'pages': pages}, f)
+        os.replace(tmp_meta, meta_path)
+
+        self._evict(keep=key)
+        return cached_pdf
+
+    def temp_path(self) -> str:
+        """Path inside the cache directory for a conversion in progress."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(self.cache_dir, f"tmp_{uuid.uuid4().hex}.pdf")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.pdf", f"{base}.json"
+
+    def _evict(self, keep: str):
+        """Drop least recently used entries until the cache fits its budget."""
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pdf') or name.startswith('tmp_'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name[:-4]))
+            total_size += stat.st_size
+
+        for _, size, key in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            if key == keep:
+                continue
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total_size -= size
+
+
+conversion_cache = ConversionCache(
+    cache_dir=os.path.join(settings.UPLOAD_DIR, "cache", "conversions"),
+    max_size_bytes=settings.CONVERSION_CACHE_MAX_MB * 1024 * 1024
+)
@@ -0,0 +1,261 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, NamedTuple, Optional
+
+from docx.styles import BabelFish
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+FALSE_VALUES = ("0", "false", "off")
+
+# Drawing objects: DrawingML (w:drawing) and legacy VML (w:pict)
+IMAGE_TAGS = (f"{W}drawing", f"{W}pict")
+
+
+class DocumentStatistics(NamedTuple):
+    word_count: int
+    char_count: int
+    image_count: int
+    text_head: str
+
+
+class DocxHeadReader:
+    """
+    Reads the beginning of a DOCX without building the python-docx tree.
+
+    ``word/document.xml`` is streamed out of the ZIP with an incremental XML
+    parser and reading stops as soon as enough paragraphs have been
+    collected. Processed paragraphs are dropped from the tree, so time and
+    memory depend on the requested head, not on the document size. Only the
+    document and styles parts are opened; media parts are never read.
+
+    Paragraphs are reported like DocxParser.extract_paragraphs: top-level
+    body paragraphs only (no tables), same text, style, bold and size rules.
+    ``read_statistics`` streams the whole document the same way.
+    """
+
+    @staticmethod
+    def read_paragraphs(
+        file_path: str,
+        max_paragraphs: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Read leading non-empty paragraphs with their formatting.
+
+        Args:
+            file_path: Path to DOCX file
+            max_paragraphs: Stop after this many paragraphs
+            max_chars: Stop once this much stripped text is collected
+
+        Returns:
+            List of {'text': str, 'style': str, 'bold': bool, 'size': Optional[float]}
+        """
+        paragraphs = []
+        total_chars = 0
+
+        with zipfile.ZipFile(file_path) as package:
+            styles = DocxHeadReader._read_styles(package)
+            default_style = styles.get(None, {'name': '', 'bold': False, 'size': None})
+
+            with package.open('word/document.xml') as stream:
+                depth = 0
+                body = None
+                for event, element in ET.iterparse(stream, events=('start', 'end')):
+                    if event == 'start':
+                        depth += 1
+                        if depth == 2 and element.tag == f'{W}body':
+                            body = element
+                        continue
+
+                    depth -= 1
+                    # Direct children of w:body: paragraphs, tables, sections
+                    if depth != 2 or body is None:
+                        continue
+
+                    if element.tag == f'{W}p':
+                        paragraph = DocxHeadReader._paragraph(element, styles, default_style)
+                        if paragraph is not None:
+                            paragraphs.append(paragraph)
+                            total_chars += len(paragraph['text'])
+                    body.remove(element)
+
+                    if max_paragraphs is not None and len(paragraphs) >= max_paragraphs:
+                        break
+                    if max_chars is not None and total_chars >= max_chars:
+                        break
+
+        return paragraphs
+
+    @staticmethod
+    def read_text(file_path: str, max_chars: int = 2000) -> str:
+        """
+        Read text from the beginning of a DOCX file.
+
+        Same result as DocxParser.extract_text.
+
+        Args:
+            file_path: Path to DOCX file
+            max_chars: Maximum number of characters to extract
+
+        Returns:
+            Stripped paragraphs joined by newlines, cut to max_chars
+        """
+        paragraphs = DocxHeadReader.read_paragraphs(file_path, max_chars=max_chars)
+        return "\n".join(p['text'] for p in paragraphs)[:max_chars]
+
+    @staticmethod
+    def read_statistics(file_path: str, head_chars: int = 3000) -> DocumentStatistics:
+        """
+        Count words, characters and images in one streaming pass.
+
+        Paragraphs inside tables and text boxes are counted; the text head
+        is built like read_text, from top-level paragraphs. Images are
+        counted by drawing objects in the text, media parts are not opened.
+        ``mc:Fallback`` is skipped: Word stores shapes and text boxes twice,
+        as DrawingML in ``mc:Choice`` and as a VML copy in the fallback.
+
+        Args:
+            file_path: Path to DOCX file
+            head_chars: Length of the text head to keep
+
+        Returns:
+            DocumentStatistics
+        """
+        word_count = 0
+        char_count = 0
+        image_count = 0
+        head_parts = []
+        head_length = 0
+        fallback_depth = 0
+
+        with zipfile.ZipFile(file_path) as package:
+            with package.open('word/document.xml') as stream:
+                depth = 0
+                body = None
+                for event, element in ET.iterparse(stream, events=('start', 'end')):
+                    if event == 'start':
+                        depth += 1
+                        if depth == 2 and element.tag == f'{W}body':
+                            body = element
+                        elif element.tag == f'{MC}Fallback':
+                            fallback_depth += 1
+                        continue
+
+                    depth -= 1
+                    if element.tag == f'{MC}Fallback':
+                        fallback_depth -= 1
+                    elif fallback_depth:
+                        # Copy of the mc:Choice content, counted there
+                        pass
+                    elif element.tag in IMAGE_TAGS:
+                        image_count += 1
+                    elif element.tag == f'{W}p':
+                        text = "".join(
+                            DocxHeadReader._run_text(run)
+                            for run in element.findall(f'{W}r') + element.findall(f'{W}hyperlink/{W}r')
+                        )
+                        word_count += len(text.split())
+                        char_count += len(text)
+                        if depth == 2 and head_length < head_chars and text.strip():
+                            head_parts.append(text.strip())
+                            head_length += len(head_parts[-1])
+
+                    if depth == 2 and body is not None:
+                        body.remove(element)
+
+        return DocumentStatistics(
+            word_count=word_count,
+            char_count=char_count,
+            image_count=image_count,
+            text_head="\n".join(head_parts)[:head_chars]
+        )
+
+    @staticmethod
+    def _paragraph(element: ET.Element, styles: Dict, default_style: dict) -> Optional[dict]:
+        raw_text = "".join(
+            DocxHeadReader._run_text(run)
+            for run in element.findall(f'{W}r') + element.findall(f'{W}hyperlink/{W}r')
+        )
+        text = raw_text.strip()
+        if not text:
+            return None
+
+        style_id = element.find(f'{W}pPr/{W}pStyle')
+        style = default_style
+        if style_id is not None:
+            style = styles.get(style_id.get(f'{W}val'), default_style)
+
+        runs = [run for run in element.findall(f'{W}r') if DocxHeadReader._run_text(run).strip()]
+        bold = bool(runs) and all(
+            DocxHeadReader._bold(run.find(f'{W}rPr'), style['bold']) for run in runs
+        )
+        sizes = [
+            size for size in (DocxHeadReader._size(run.find(f'{W}rPr')) for run in runs)
+            if size is not None
+        ]
+
+        return {
+            'text': text,
+            'style': style['name'],
+            'bold': bold or (not runs and style['bold']),
+            'size': max(sizes) if sizes else style['size'],
+        }
+
+    @staticmethod
+    def _run_text(run: ET.Element) -> str:
+        parts = []
+        for child in run:
+            if child.tag == f'{W}t':
+                parts.append(child.text or '')
+            elif child.tag == f'{W}tab':
+                parts.append('\t')
+            elif child.tag == f'{W}cr':
+                parts.append('\n')
+            elif child.tag == f'{W}br' and child.get(f'{W}type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        return "".join(parts)
+
+    @staticmethod
+    def _bold(rpr: Optional[ET.Element], inherited: bool) -> bool:
+        b = rpr.find(f'{W}b') if rpr is not None else None
+        if b is None:
+            return inherited
+        return b.get(f'{W}val', 'true').lower() not in FALSE_VALUES
+
+    @staticmethod
+    def _size(rpr: Optional[ET.Element]) -> Optional[float]:
+        sz = rpr.find(f'{W}sz') if rpr is not None else None
+        if sz is None:
+            return None
+        try:
+            return int(sz.get(f'{W}val')) / 2  # half-points
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _read_styles(package: zipfile.ZipFile) -> Dict[Optional[str], dict]:
+        """Paragraph styles by id; the default paragraph style is also under None."""
+        styles: Dict[Optional[str], dict] = {}
+        try:
+            with package.open('word/styles.xml') as stream:
+                root = ET.parse(stream).getroot()
+        except KeyError:
+            return styles
+
+        for style in root.findall(f'{W}style'):
+            if style.get(f'{W}type') != 'paragraph':
+                continue
+            name = style.find(f'{W}name')
+            rpr = style.find(f'{W}rPr')
+            info = {
+                # python-docx shows built-in styles by UI name ("heading 1" -> "Heading 1")
+                'name': BabelFish.internal2ui(name.get(f'{W}val')) if name is not None else '',
+                'bold': DocxHeadReader._bold(rpr, False),
+                'size': DocxHeadReader._size(rpr),
+            }
+            styles[style.get(f'{W}styleId')] = info
+            if style.get(f'{W}default') in ('1', 'true'):
+                styles[None] = info
+        return styles
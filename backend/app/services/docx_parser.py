@@ -1,11 +1,174 @@
 from docx import Document
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 import os
+import zipfile
+import threading
+
+from app.core.config import settings
+from app.services.docx_head_reader import DocxHeadReader
+
+
+class ParsedDocument:
+    """
+    DOCX document parsed once.
+
+    Everything callers need from python-docx is read in a single pass at
+    construction; the Document tree itself is not kept. Construction raises
+    on files python-docx cannot open, which doubles as validation.
+    """
+
+    # Paragraphs whose formatting is kept, enough for title/author detection
+    STYLED_PARAGRAPHS = 30
+
+    def __init__(self, file_path: str):
+        doc = Document(file_path)
+        self.file_path = file_path
+        self.paragraphs: List[str] = []  # non-empty paragraphs, as in the document
+        self.styled_paragraphs: List[dict] = []
+
+        for paragraph in doc.paragraphs:
+            if not paragraph.text.strip():
+                continue
+            self.paragraphs.append(paragraph.text)
+            if len(self.styled_paragraphs) < self.STYLED_PARAGRAPHS:
+                self.styled_paragraphs.append(self._styled(paragraph))
+
+        props = doc.core_properties
+        self.core_properties = {
+            'title': props.title or None,
+            'author': props.author or None,
+            'language': props.language or None,
+            'created': props.created,
+            'modified': props.modified,
+        }
+        self._full_text: Optional[str] = None
+
+    def head_text(self, max_chars: int = 2000) -> str:
+        """Text from the beginning of the document, stripped paragraphs joined by newlines."""
+        text_parts = []
+        total_chars = 0
+        for text in self.paragraphs:
+            text = text.strip()
+            text_parts.append(text)
+            total_chars += len(text)
+            if total_chars >= max_chars:
+                break
+        return "\n".join(text_parts)[:max_chars]
+
+    @property
+    def full_text(self) -> str:
+        if self._full_text is None:
+            self._full_text = "\n".join(self.paragraphs)
+        return self._full_text
+
+    @property
+    def word_count(self) -> int:
+        return len(self.full_text.split())
+
+    @staticmethod
+    def _styled(paragraph) -> dict:
+        style_font = paragraph.style.font if paragraph.style is not None else None
+        style_bold = bool(style_font and style_font.bold)
+        style_size = style_font.size.pt if style_font and style_font.size else None
+
+        runs = [run for run in paragraph.runs if run.text.strip()]
+        bold = bool(runs) and all(
+            run.bold if run.bold is not None else style_bold for run in runs
+        )
+        sizes = [run.font.size.pt for run in runs if run.font.size is not None]
+
+        return {
+            'text': paragraph.text.strip(),
+            'style': paragraph.style.name if paragraph.style is not None else '',
+            'bold': bold or (not runs and style_bold),
+            'size': max(sizes) if sizes else style_size,
+        }
+
+
+class ParsedDocumentCache:
+    """
+    LRU cache of ParsedDocument keyed by path, mtime and size.
+
+    A rewritten file gets a new key, so stale entries are never returned;
+    they just age out. Safe to use from worker threads.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], ParsedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> ParsedDocument:
+        """
+        Return parsed document, parsing it on a miss.
+
+        Raises:
+            Exception: If the file cannot be parsed; failures are not cached
+        """
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            document = self._entries.get(key)
+            if document is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        # Parse outside the lock; a concurrent miss on the same file parses twice
+        document = ParsedDocument(file_path)
+
+        with self._lock:
+            self._entries[key] = document
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return document
+
+    def peek(self, file_path: str) -> Optional[ParsedDocument]:
+        """Return parsed document if it is cached and the file is unchanged; never parses."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            document = self._entries.get(key)
+            if document is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return document
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+parsed_document_cache = ParsedDocumentCache(settings.DOCX_PARSE_CACHE_ENTRIES)
 
 
 class DocxParser:
     """Service for parsing DOCX files."""
 
+    @staticmethod
+    def parse(file_path: str) -> ParsedDocument:
+        """
+        Get parsed document, from cache when the file has not changed.
+
+        Args:
+            file_path: Path to DOCX file
+
+        Returns:
+            ParsedDocument
+        """
+        try:
+            return parsed_document_cache.get(file_path)
+        except Exception as e:
+            raise Exception(f"Error parsing DOCX file: {str(e)}")
+
     @staticmethod
     def extract_text(file_path: str, max_chars: int = 2000) -> str:
         """
@@ -18,21 +181,12 @@ class DocxParser:
         Returns:
             Extracted text from the beginning of the document
         """
+        document = parsed_document_cache.peek(file_path)
+        if document is not None:
+            return document.head_text(max_chars)
+        # Stream only the head instead of building the whole document tree
         try:
-            doc = Document(file_path)
-            text_parts = []
-            total_chars = 0
-
-            for paragraph in doc.paragraphs:
-                text = paragraph.text.strip()
-                if text:
-                    text_parts.append(text)
-                    total_chars += len(text)
-
-                    if total_chars >= max_chars:
-                        break
-
-            return "\n".join(text_parts)[:max_chars]
+            return DocxHeadReader.read_text(file_path, max_chars)
         except Exception as e:
             raise Exception(f"Error parsing DOCX file: {str(e)}")
 
@@ -47,9 +201,25 @@ class DocxParser:
         Returns:
             Full text content
         """
+        return DocxParser.parse(file_path).full_text
+
+    @staticmethod
+    def extract_paragraphs(file_path: str, max_paragraphs: int = 30) -> List[dict]:
+        """
+        Extract leading non-empty paragraphs with their formatting.
+
+        Args:
+            file_path: Path to DOCX file
+            max_paragraphs: Maximum number of paragraphs to return
+
+        Returns:
+            List of {'text': str, 'style': str, 'bold': bool, 'size': Optional[float]}
+        """
+        document = parsed_document_cache.peek(file_path)
+        if document is not None and max_paragraphs <= ParsedDocument.STYLED_PARAGRAPHS:
+            return document.styled_paragraphs[:max_paragraphs]
         try:
-            doc = Document(file_path)
-            return "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+            return DocxHeadReader.read_paragraphs(file_path, max_paragraphs=max_paragraphs)
         except Exception as e:
             raise Exception(f"Error parsing DOCX file: {str(e)}")
 
@@ -65,7 +235,27 @@ class DocxParser:
             True if valid DOCX, False otherwise
         """
         try:
-            Document(file_path)
+            DocxParser.parse(file_path)
             return True
         except Exception:
             return False
+
+    @staticmethod
+    def is_docx_package(file_path: str) -> bool:
+        """
+        Cheap check that file looks like a DOCX: a ZIP with a main document part.
+
+        Reads only the ZIP directory, so it is safe to call on the upload path;
+        the document itself is parsed later by validate_docx/extract_text.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            True if file is a ZIP containing word/document.xml
+        """
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                return 'word/document.xml' in package.namelist()
+        except (zipfile.BadZipFile, OSError):
+            return False
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.models import GenerationTask
+from app.services.progress_bus import publish_generation_status
+
+logger = logging.getLogger("autoredactor")
+
+STALE_MESSAGE = "Генерация прервана: обработчик не ответил"
+
+
+class GenerationSweeper:
+    """
+    Fails generation tasks left in "processing" by a worker that died.
+
+    A task still processing ``stale_after`` seconds after it started has
+    outlived Celery's hard time limit, so no worker is building it any
+    more. Rows are claimed with a single conditional UPDATE ... RETURNING,
+    so with several application replicas each stale task is failed and
+    published exactly once.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, interval: int, stale_after: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.stale_after = stale_after
+        self.swept = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"swept": self.swept}
+
+    async def sweep(self) -> int:
+        """Fail stale tasks now; returns their number."""
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(GenerationTask)
+                .where(
+                    GenerationTask.status == "processing",
+                    GenerationTask.started_at < now - timedelta(seconds=self.stale_after)
+                )
+                .values(status="error", error_message=STALE_MESSAGE, completed_at=now)
+                .returning(GenerationTask)
+            )
+            tasks = result.scalars().all()
+            await session.commit()
+
+        for task in tasks:
+            logger.warning(f"Задача генерации {task.id} зависла в обработке, отмечена как ошибка")
+            await publish_generation_status(task)
+        self.swept += len(tasks)
+        return len(tasks)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Ошибка проверки зависших задач генерации: {e}")
+            await asyncio.sleep(self.interval)
+
+
+generation_sweeper = GenerationSweeper(
+    session_factory=AsyncSessionLocal,
+    interval=settings.GENERATION_SWEEP_INTERVAL,
+    # Past the hard limit plus the broker redelivery delay
+    stale_after=settings.GENERATION_TIME_LIMIT + 60
+)
@@ -0,0 +1,179 @@
+import re
+from typing import List, Optional, Tuple
+
+from app.models.article import ArticleMetadata
+from app.services.docx_parser import DocxParser
+
+CYR_UPPER = "А-ЯЁӘҒҚҢӨҰҮҺІ"
+CYR_LOWER = "а-яёәғқңөұүһі"
+
+
+def _author_pattern(upper: str, lower: str) -> str:
+    surname = rf"[{upper}][{lower}'’]+(?:-[{upper}][{lower}]+)?"
+    initials = rf"[{upper}]\.\s?(?:[{upper}]\.)?"
+    return (
+        rf"(?P<surname>{surname})\s+(?P<initials>{initials})"
+        rf"|(?P<initials_first>{initials})\s?(?P<surname_last>{surname})"
+    )
+
+
+# "Иванов И.И.", "И.И. Иванов", "Smith J.A.", "J. Smith"
+AUTHOR_PATTERNS = [
+    re.compile(_author_pattern(CYR_UPPER, CYR_LOWER)),
+    re.compile(_author_pattern("A-Z", "a-z")),
+]
+
+# Leftovers allowed on an author line besides the names themselves
+AUTHOR_SEPARATORS = re.compile(r"[\s,;*\d¹²³⁴⁵⁶⁷⁸⁹⁰]|\bи\b|\band\b|\bжәне\b")
+
+# Classification codes and other service lines that precede the title
+SERVICE_LINE = re.compile(r"^(УДК|UDC|МРНТИ|ГРНТИ|IRSTI|DOI|ББК)\b", re.IGNORECASE)
+
+HEADING_STYLES = ("title", "heading", "заголовок", "название")
+
+# Title evidence: heading style > bold/enlarged font > position only
+STRONG, MEDIUM, WEAK = 0.4, 0.3, 0.1
+
+
+class HeuristicExtractor:
+    """
+    Deterministic metadata extraction for articles that follow the house template.
+
+    Looks at paragraph styles, bold and enlarged runs to find the title and
+    at surname-plus-initials patterns (Latin and Cyrillic) to find the
+    author line. The confidence score tells whether the result can be used
+    without asking the AI.
+    """
+
+    def __init__(self, docx_parser: Optional[DocxParser] = None):
+        self.docx_parser = docx_parser or DocxParser()
+
+    def extract(self, file_path: str) -> ArticleMetadata:
+        """
+        Extract title, author, and language from DOCX formatting.
+
+        Args:
+            file_path: Path to DOCX file
+
+        Returns:
+            ArticleMetadata; confidence is 0 when nothing was recognised
+        """
+        paragraphs = self.docx_parser.extract_paragraphs(file_path, max_paragraphs=15)
+        return self.extract_from_paragraphs(paragraphs)
+
+    def extract_from_paragraphs(self, paragraphs: List[dict]) -> ArticleMetadata:
+        author_index, authors = self._find_authors(paragraphs)
+        title_range, title_score = self._find_title(paragraphs, author_index)
+
+        confidence = 0.0
+        author = "Unknown Author"
+        if authors:
+            author = ", ".join(authors)
+            confidence += 0.45
+
+        title = "Untitled"
+        if title_range:
+            start, end = title_range
+            title = " ".join(p['text'] for p in paragraphs[start:end])
+            confidence += title_score
+            # Title and author both near the top is what the template looks like
+            if authors and max(end, author_index + 1) <= 6:
+                confidence += 0.1
+
+        return ArticleMetadata(
+            title=title,
+            author=author,
+            language=self.detect_language(author),
+            confidence=round(min(confidence, 0.95), 2)
+        )
+
+    def _find_authors(self, paragraphs: List[dict]) -> Tuple[int, List[str]]:
+        """Find first paragraph made only of author names."""
+        for index, paragraph in enumerate(paragraphs[:10]):
+            text = paragraph['text']
+            if len(text) > 200:
+                continue
+
+            for pattern in AUTHOR_PATTERNS:
+                matches = list(pattern.finditer(text))
+                if not matches:
+                    continue
+                leftover = AUTHOR_SEPARATORS.sub("", pattern.sub("", text))
+                if len(leftover) <= 3:
+                    return index, [self._normalize_author(m) for m in matches]
+
+        return -1, []
+
+    def _find_title(
+        self,
+        paragraphs: List[dict],
+        author_index: int
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """Find title paragraphs; returns ((start, end), score)."""
+        # Title goes above the authors; some templates put the authors first
+        limit = author_index if author_index > 0 else min(len(paragraphs), 8)
+        candidates = [
+            index for index in range(limit)
+            if index != author_index
+            and len(paragraphs[index]['text']) >= 5
+            and not SERVICE_LINE.match(paragraphs[index]['text'])
+        ]
+        if not candidates:
+            return None, 0.0
+
+        body_size = self._body_font_size(paragraphs)
+        scored = [(self._title_score(paragraphs[i], body_size), i) for i in candidates]
+        best_score = max(score for score, _ in scored)
+        start = next(i for score, i in scored if score == best_score)
+
+        # Titles broken over several lines keep the same formatting
+        end = start + 1
+        while (
+            end < len(paragraphs)
+            and end != author_index
+            and self._same_format(paragraphs[start], paragraphs[end])
+            and len(paragraphs[end]['text']) < 200
+        ):
+            end += 1
+
+        return (start, end), best_score
+
+    @staticmethod
+    def _title_score(paragraph: dict, body_size: Optional[float]) -> float:
+        style = (paragraph['style'] or '').lower()
+        if any(name in style for name in HEADING_STYLES):
+            return STRONG
+        if paragraph['bold'] or (
+            body_size and paragraph['size'] and paragraph['size'] > body_size
+        ):
+            return MEDIUM
+        return WEAK
+
+    @staticmethod
+    def _same_format(first: dict, second: dict) -> bool:
+        return (
+            first['style'] == second['style']
+            and first['bold'] == second['bold']
+            and first['size'] == second['size']
+            and (first['bold'] or 'heading' in (first['style'] or '').lower())
+        )
+
+    @staticmethod
+    def _body_font_size(paragraphs: List[dict]) -> Optional[float]:
+        sizes = sorted(p['size'] for p in paragraphs if p['size'])
+        return sizes[len(sizes) // 2] if sizes else None
+
+    @staticmethod
+    def _normalize_author(match: re.Match) -> str:
+        """Bring author to 'Фамилия И.О.' form."""
+        surname = match.group('surname') or match.group('surname_last')
+        initials = match.group('initials') or match.group('initials_first')
+        return f"{surname} {initials.replace(' ', '')}"
+
+    @staticmethod
+    def detect_language(author: str) -> str:
+        """Script of an author name: 'cyrillic' or 'latin'."""
+        first_char = author.strip()[:1].upper()
+        if first_char and re.match(f"[{CYR_UPPER}]", first_char):
+            return "cyrillic"
+        return "latin"
@@ -1,19 +1,49 @@
 import os
-from typing import List, Dict, Optional
+import json
+import asyncio
+import hashlib
+import logging
+from typing import List, Dict, Optional, Tuple, Union
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db.models import Article, Template, GenerationTask
-from app.services.pdf_generator import PDFGenerator
+from app.services.pdf_generator import (
+    PDFGenerator, BlankPages, ReusedPages, ReusedPagesError, MissingPartError, OutlineItem,
+    PageLink, TocLayout, TOC_LAYOUT_VERSION
+)
+from app.services.build_manifest import BuildManifest, ManifestPart
+from app.services.pdf_optimizer import PdfOptimizer, pdf_optimizer
 from app.models.journal import JournalSettings
+from app.services.progress_bus import publish_generation_status
+from app.services.progress_reporter import ProgressReporter
+
+logger = logging.getLogger("autoredactor")
+
+WORDS_PER_PAGE = 500
+DEFAULT_ARTICLE_PAGES = 5  # Statistics not read yet
+
+# Bookmark titles of journal sections
+SECTION_TITLES = {
+    'title': "Титульный лист",
+    'intro': "Вступительные страницы",
+    'toc': "Содержание",
+    'outro': "Заключительные страницы",
+}
+
+
+def pages_for_words(word_count: int) -> int:
+    """Rough page count of a text: ~500 words per page, rounded up."""
+    return max(1, -(-word_count // WORDS_PER_PAGE))
 
 
 class JournalBuilder:
     """Service for building complete journal PDF."""
 
-    def __init__(self, pdf_generator: PDFGenerator):
+    def __init__(self, pdf_generator: PDFGenerator, optimizer: Optional[PdfOptimizer] = None):
         self.pdf_generator = pdf_generator
+        self.optimizer = optimizer or pdf_optimizer
 
     async def build_journal(
         self,
@@ -39,103 +69,338 @@ class JournalBuilder:
             Path to generated PDF
         """
         temp_dir = os.path.dirname(output_path)
-        pdf_parts = []
+        parts: List[ManifestPart] = []
+        # Source of each part; None for articles known from the previous build
+        sources: List[Union[str, BlankPages, None]] = []
+        part_articles: Dict[int, Article] = {}
+        temp_files = []
         current_page = 1
         toc_entries = []
+        reporter = ProgressReporter(session, task)
+
+        def add_part(kind: str, part_hash: str, pages: int, source):
+            nonlocal current_page
+            parts.append(ManifestPart(kind, part_hash, pages, current_page - 1))
+            sources.append(source)
+            current_page += pages
+
+        async def create_toc() -> str:
+            toc_path = os.path.join(temp_dir, f"toc_{task.id}.pdf")
+            await asyncio.to_thread(
+                self.pdf_generator.create_toc_pdf, toc_entries, toc_path, layout=toc_layout
+            )
+            temp_files.append(toc_path)
+            return toc_path
+
+        async def pdf_parts(
+            manifest: Optional[BuildManifest],
+            progress: Tuple[int, int]
+        ) -> List[Union[str, BlankPages, ReusedPages]]:
+            # Parts unchanged since the manifest's build at the same pages are
+            # copied from its output; moved ones need their source PDF. The
+            # output may be gone since the TOC was found reusable: render it.
+            result: List[Union[str, BlankPages, ReusedPages, None]] = []
+            for part, source in zip(parts, sources):
+                reused = manifest.reusable(part) if manifest else None
+                result.append(reused or source)
+
+            moved = []
+            for index, part in enumerate(result):
+                if part is not None:
+                    continue
+                if parts[index].kind == 'toc':
+                    result[index] = sources[index] = await create_toc()
+                else:
+                    moved.append(index)
+            if moved:
+                results = await self._convert_articles(
+                    reporter, [part_articles[index] for index in moved], settings, progress
+                )
+                for index, (article_pdf, _) in zip(moved, results):
+                    result[index] = article_pdf
+            return result
+
+        async def assemble(to_assemble: List[Union[str, BlankPages, ReusedPages]]):
+            try:
+                await asyncio.to_thread(
+                    self.pdf_generator.assemble_pdf, to_assemble, output_path,
+                    outline=outline, links=links
+                )
+            except MissingPartError as e:
+                # Conversions evicted from the cache since they were looked up
+                missing = [
+                    index for index, part in enumerate(to_assemble)
+                    if index in part_articles and isinstance(part, str) and not os.path.exists(part)
+                ]
+                if not missing:
+                    raise
+                logger.warning(f"{e}, повторная конвертация статей: {len(missing)}")
+                results = await self._convert_articles(
+                    reporter, [part_articles[index] for index in missing], settings, (90, 90)
+                )
+                for index, (article_pdf, _) in zip(missing, results):
+                    to_assemble[index] = article_pdf
+                await asyncio.to_thread(
+                    self.pdf_generator.assemble_pdf, to_assemble, output_path,
+                    outline=outline, links=links
+                )
 
         try:
+            previous = await self._previous_manifest(session, task)
+            fingerprint = settings.format_fingerprint()
+
             # 1. Title page
-            await self._update_progress(session, task, 10, "Добавление титульного листа")
+            await reporter.update(10, "Добавление титульного листа")
             if templates.get('title'):
-                title_pdf = templates['title'].file_path
-                pdf_parts.append(title_pdf)
-                current_page += self.pdf_generator.get_pdf_page_count(title_pdf)
+                add_part('title', *await self._template_part(templates['title'], previous))
 
             # 2. Intro pages
-            await self._update_progress(session, task, 20, "Добавление вступительных страниц")
+            await reporter.update(20, "Добавление вступительных страниц")
             if templates.get('intro'):
-                intro_pdf = templates['intro'].file_path
-                pdf_parts.append(intro_pdf)
-                current_page += self.pdf_generator.get_pdf_page_count(intro_pdf)
-
-            # 3. Convert and add articles
-            total_articles = len(articles)
-            for index, article in enumerate(articles):
-                progress = 20 + int((index / total_articles) * 50)
-                await self._update_progress(
-                    session,
-                    task,
-                    progress,
-                    f"Конвертация статей ({index + 1}/{total_articles})"
-                )
+                add_part('intro', *await self._template_part(templates['intro'], previous))
+
+            # 3. Articles seen in the previous build take their page count from
+            # its manifest; the rest are converted concurrently
+            keys = await asyncio.to_thread(self._article_keys, articles, fingerprint)
+            known_pages = [previous.page_count(key) if previous else None for key in keys]
+            pending = [index for index, pages in enumerate(known_pages) if pages is None]
+            converted = dict(zip(pending, await self._convert_articles(
+                reporter, [articles[index] for index in pending], settings, (20, 50)
+            )))
+            indent_pages = BlankPages(settings.indent_lines)
+            indent_hash = f"blank:{indent_pages.count}:{indent_pages.page_size}"
 
+            for index, (article, key) in enumerate(zip(articles, keys)):
                 # Add blank pages before article (indent)
                 if settings.indent_lines > 0:
-                    blank_pdf = os.path.join(temp_dir, f"blank_{article.id}.pdf")
-                    self.pdf_generator.add_blank_pages(settings.indent_lines, blank_pdf)
-                    pdf_parts.append(blank_pdf)
-                    current_page += settings.indent_lines
+                    add_part('indent', indent_hash, indent_pages.count, indent_pages)
 
-                # Convert DOCX to PDF
-                article_pdf = os.path.join(temp_dir, f"article_{article.id}.pdf")
-                self.pdf_generator.docx_to_pdf(article.file_path, article_pdf)
-                pdf_parts.append(article_pdf)
+                article_pdf, article_pages = converted.get(index, (None, known_pages[index]))
+                article.page_count = article_pages
 
                 # Track page for TOC
-                article_pages = self.pdf_generator.get_pdf_page_count(article_pdf)
-                toc_entries.append({
-                    'title': article.title or 'Untitled',
-                    'author': article.author or 'Unknown',
-                    'page': current_page
-                })
-                current_page += article_pages
-
-            # 4. Create TOC
-            await self._update_progress(session, task, 75, "Формирование содержания")
-            toc_pdf = os.path.join(temp_dir, "toc.pdf")
-            self.pdf_generator.create_toc_pdf(toc_entries, toc_pdf)
-            pdf_parts.append(toc_pdf)
+                toc_entries.append(self._toc_entry(article, current_page))
+                part_articles[len(parts)] = article
+                add_part('article', key, article_pages, article_pdf)
+
+            # 4. Create TOC, unless the previous build has the same one at the same place
+            await reporter.update(75, "Формирование содержания")
+            toc_hash = self._toc_hash(toc_entries)
+            toc_layout = await asyncio.to_thread(self.pdf_generator.layout_toc, toc_entries)
+            toc_source = None
+            if not (previous and previous.reusable(
+                ManifestPart('toc', toc_hash, toc_layout.page_count, current_page - 1)
+            )):
+                toc_source = await create_toc()
+            add_part('toc', toc_hash, toc_layout.page_count, toc_source)
 
             # 5. Outro pages
-            await self._update_progress(session, task, 85, "Добавление заключительных страниц")
+            await reporter.update(85, "Добавление заключительных страниц")
             if templates.get('outro'):
-                outro_pdf = templates['outro'].file_path
-                pdf_parts.append(outro_pdf)
+                add_part('outro', *await self._template_part(templates['outro'], previous))
+
+            # 6. Reuse pages of the previous output where possible
+            parts_to_assemble = await pdf_parts(previous, (50, 70))
+            reused_count = sum(isinstance(part, ReusedPages) for part in parts_to_assemble)
+            if previous:
+                logger.info(f"Сборка: повторно использовано частей {reused_count} из {len(parts)}")
 
-            # 6. Merge all parts
-            await self._update_progress(session, task, 90, "Объединение PDF")
-            merged_pdf = os.path.join(temp_dir, f"merged_{task.id}.pdf")
-            self.pdf_generator.merge_pdfs(pdf_parts, merged_pdf)
+            # 7. Assemble all parts and number pages in a single pass,
+            # with bookmarks and links from the TOC to articles
+            await reporter.update(90, "Сборка PDF и нумерация страниц")
+            outline, links = self._navigation(parts, part_articles, toc_layout)
+            try:
+                await assemble(parts_to_assemble)
+            except ReusedPagesError as e:
+                # The previous output was removed after it was checked
+                logger.warning(f"Предыдущий результат недоступен ({e}), сборка из исходных файлов")
+                await assemble(await pdf_parts(None, (90, 90)))
 
-            # 7. Add page numbers
-            await self._update_progress(session, task, 95, "Нумерация страниц")
-            self.pdf_generator.add_page_numbers(merged_pdf, output_path)
+            # 8. Linearize for fast web view; pages stay the same, so the
+            # manifest still describes the optimized file
+            await reporter.update(95, "Оптимизация PDF")
+            await asyncio.to_thread(self.optimizer.optimize, output_path)
+            task.manifest = BuildManifest(output_path, parts).to_json()
 
-            # 8. Cleanup temporary files
-            await self._update_progress(session, task, 98, "Финализация")
-            self._cleanup_temp_files(pdf_parts + [merged_pdf])
+            # 9. Cleanup temporary files (templates and cached conversions are kept)
+            await reporter.update(98, "Финализация")
+            self._cleanup_temp_files(temp_files)
 
-            await self._update_progress(session, task, 100, "Готово")
+            await reporter.update(100, "Готово")
+            await reporter.close()
             return output_path
 
         except Exception as e:
+            await reporter.close()
             task.status = "error"
             task.error_message = str(e)
             await session.commit()
+            await publish_generation_status(task)
             raise
 
-    async def _update_progress(
+    async def _previous_manifest(
         self,
         session: AsyncSession,
-        task: GenerationTask,
-        progress: int,
-        step: str
-    ):
-        """Update task progress."""
-        task.progress = progress
-        task.current_step = step
-        task.status = "processing"
-        await session.commit()
+        task: GenerationTask
+    ) -> Optional[BuildManifest]:
+        """Manifest of the latest finished build of the same session."""
+        result = await session.execute(
+            select(GenerationTask.manifest)
+            .where(
+                GenerationTask.session_id == task.session_id,
+                GenerationTask.id != task.id,
+                GenerationTask.status == "done",
+                GenerationTask.manifest.isnot(None)
+            )
+            .order_by(GenerationTask.completed_at.desc())
+            .limit(1)
+        )
+        return BuildManifest.from_json(result.scalar_one_or_none())
+
+    async def _template_part(
+        self,
+        template: Template,
+        previous: Optional[BuildManifest]
+    ) -> Tuple[str, int, str]:
+        """Hash, page count and PDF path of a template part."""
+        part_hash = f"template:{template.file_hash or template.file_path}"
+        pages = previous.page_count(part_hash) if previous else None
+        if pages is None:
+            pages = await asyncio.to_thread(
+                self.pdf_generator.get_pdf_page_count, template.file_path
+            )
+        return part_hash, pages, template.file_path
+
+    def _article_keys(self, articles: List[Article], fingerprint: str) -> List[str]:
+        """Conversion cache keys of articles, they identify the article PDFs."""
+        return [
+            self.pdf_generator.cache.make_key(article.file_path, fingerprint, article.file_hash)
+            for article in articles
+        ]
+
+    @staticmethod
+    def _navigation(
+        parts: List[ManifestPart],
+        part_articles: Dict[int, Article],
+        toc_layout: TocLayout
+    ) -> Tuple[List[OutlineItem], List[PageLink]]:
+        """
+        Bookmarks and TOC links of the assembled journal.
+
+        Returns:
+            (outline, links): a bookmark per section with articles grouped
+            under one entry, and a link from every TOC entry to its article
+        """
+        outline: List[OutlineItem] = []
+        article_items: List[OutlineItem] = []
+        article_pages: List[int] = []
+        toc_offset = None
+
+        for index, part in enumerate(parts):
+            if part.kind == 'article':
+                article = part_articles[index]
+                title = article.title or 'Untitled'
+                if article.author:
+                    title = f"{article.author} — {title}"
+                article_items.append(OutlineItem(title, part.offset))
+                article_pages.append(part.offset)
+                continue
+            if part.kind == 'indent':
+                continue
+
+            if part.kind == 'toc':
+                toc_offset = part.offset
+                if article_items:
+                    outline.append(
+                        OutlineItem("Статьи", article_items[0].page, tuple(article_items))
+                    )
+            outline.append(OutlineItem(SECTION_TITLES[part.kind], part.offset))
+
+        links = [
+            PageLink(toc_offset + line.page, line.rect, article_pages[line.entry])
+            for page in toc_layout.pages
+            for line in page
+        ] if toc_offset is not None else []
+        return outline, links
+
+    @staticmethod
+    def _toc_entry(article: Article, page: Optional[int] = None) -> dict:
+        return {
+            'title': article.title or 'Untitled',
+            'author': article.author or 'Unknown',
+            'page': page
+        }
+
+    @staticmethod
+    def _toc_hash(toc_entries: List[dict]) -> str:
+        payload = json.dumps([TOC_LAYOUT_VERSION, toc_entries], ensure_ascii=False, sort_keys=True)
+        return "toc:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _convert_articles(
+        self,
+        reporter: ProgressReporter,
+        articles: List[Article],
+        settings: JournalSettings,
+        progress: Tuple[int, int] = (20, 70)
+    ) -> List[Tuple[str, int]]:
+        """
+        Convert article DOCX files to PDF concurrently.
+
+        Conversions are fanned out to worker threads, bounded by the size of
+        the LibreOffice pool, so the event loop stays free during the build.
+        Unchanged articles, including those converted ahead of time by the
+        pre-conversion worker, are served from the conversion cache without
+        touching LibreOffice.
+
+        Args:
+            reporter: Progress reporter of the build
+            articles: Articles to convert
+            settings: Journal settings
+            progress: Progress range (from, to) to report over
+
+        Returns:
+            List of (pdf_path, page_count) in the same order as articles
+        """
+        total_articles = len(articles)
+        progress_from, progress_to = progress
+        results: List[Optional[Tuple[str, int]]] = [None] * total_articles
+        semaphore = asyncio.Semaphore(self.pdf_generator.pool.size)
+        fingerprint = settings.format_fingerprint()
+
+        async def convert(index: int, article: Article):
+            async with semaphore:
+                result = await asyncio.to_thread(
+                    self.pdf_generator.docx_to_pdf_cached,
+                    article.file_path,
+                    fingerprint,
+                    article.file_hash
+                )
+                return index, result
+
+        jobs = [
+            asyncio.create_task(convert(index, article))
+            for index, article in enumerate(articles)
+        ]
+
+        try:
+            for done, job in enumerate(asyncio.as_completed(jobs), start=1):
+                index, result = await job
+                results[index] = result
+                await reporter.update(
+                    progress_from + int((done / total_articles) * (progress_to - progress_from)),
+                    f"Конвертация статей ({done}/{total_articles})"
+                )
+        except Exception:
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+            raise
+
+        cache_stats = self.pdf_generator.cache.stats()
+        logger.info(
+            f"Кэш конвертации: попаданий {cache_stats['hits']}, промахов {cache_stats['misses']}"
+        )
+        return results
 
     def _cleanup_temp_files(self, file_paths: List[str]):
         """Remove temporary files."""
@@ -146,6 +411,20 @@ class JournalBuilder:
             except Exception:
                 pass  # Ignore cleanup errors
 
+    @staticmethod
+    def estimate_article_pages(article: Article) -> int:
+        """
+        Pages an article takes in the journal.
+
+        Uses the page count of the converted PDF when the article has been
+        converted, otherwise estimates from the stored word count.
+        """
+        if article.page_count:
+            return article.page_count
+        if article.word_count is not None:
+            return pages_for_words(article.word_count)
+        return DEFAULT_ARTICLE_PAGES
+
     async def preview_structure(
         self,
         articles: List[Article],
@@ -183,21 +462,24 @@ class JournalBuilder:
             if settings.indent_lines > 0:
                 current_page += settings.indent_lines
 
-            # Estimate article pages (rough estimate: ~500 words per page)
-            estimated_pages = 5  # Default estimate
+            article_pages = self.estimate_article_pages(article)
             structure.append({
                 'type': 'article',
                 'title': article.title,
                 'author': article.author,
-                'page_start': current_page
+                'page_start': current_page,
+                'pages': article_pages
             })
-            current_page += estimated_pages
+            current_page += article_pages
 
-        # TOC (estimate 1-2 pages)
-        toc_pages = 1 + (len(articles) // 30)  # 30 entries per page
+        # TOC, laid out exactly as the build will draw it
+        toc_pages = self.pdf_generator.layout_toc(
+            [self._toc_entry(article) for article in articles]
+        ).page_count
         structure.append({
             'type': 'toc',
-            'page_start': current_page
+            'page_start': current_page,
+            'pages': toc_pages
         })
         current_page += toc_pages
 
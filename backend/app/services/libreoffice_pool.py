@@ -0,0 +1,357 @@
+import os
+import json
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("autoredactor")
+
+BRIDGE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uno_bridge.py")
+BRIDGE_EXIT_NO_UNO = 3  # uno_bridge.EXIT_NO_UNO
+
+
+class LibreOfficeWorker:
+    """
+    Single long-lived headless LibreOffice process.
+
+    Every worker owns a separate user profile directory, so several workers
+    can run side by side without fighting over the profile lock. Profile
+    and pipe names include the PID of the process that starts soffice: the
+    pool is created at import, before Celery forks its children, and the
+    web process runs its own pool next to them. soffice
+    stays running and listens on a named pipe; documents are converted
+    through uno_bridge.py, run under ``python`` (the interpreter with the
+    UNO bindings, python3-uno), since the application interpreter usually
+    cannot import them. Without that interpreter the worker falls back to
+    one ``--convert-to`` call per document, still reusing its warm profile.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        binary: str,
+        profile_root: str,
+        timeout: int,
+        python: Optional[str] = None
+    ):
+        self.index = index
+        self.binary = binary
+        self.timeout = timeout
+        self.python = python
+        self.profile_root = profile_root
+        self.profile_dir: Optional[str] = None
+        self.pipe_name: Optional[str] = None
+        self.conversions = 0
+        self.started = False
+        self.resident = False
+        self._no_uno = False
+        self._process: Optional[subprocess.Popen] = None
+        self._bridge: Optional[subprocess.Popen] = None
+        self._pid: Optional[int] = None  # process that started soffice
+
+    @property
+    def profile_url(self) -> str:
+        return Path(self.profile_dir).resolve().as_uri()
+
+    @property
+    def bridge_available(self) -> bool:
+        return bool(self.python) and not self._no_uno and shutil.which(self.python) is not None
+
+    def start(self):
+        """Start soffice and connect the bridge to it."""
+        self._forget_inherited()
+        if self._pid is None:
+            self._pid = os.getpid()
+            self.profile_dir = os.path.join(self.profile_root, f"{self._pid}_worker_{self.index}")
+            self.pipe_name = f"autoredactor_{self._pid}_{self.index}"
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.conversions = 0
+        self.resident = False
+
+        if self.bridge_available:
+            self._process = subprocess.Popen(
+                [
+                    self.binary,
+                    '--headless',
+                    '--invisible',
+                    '--nologo',
+                    '--nodefault',
+                    '--norestore',
+                    '--nolockcheck',
+                    f'-env:UserInstallation={self.profile_url}',
+                    f'--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext',
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            self._bridge = subprocess.Popen(
+                [self.python, BRIDGE_SCRIPT, self.pipe_name, str(self.timeout)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            try:
+                self._read_reply()
+                self.resident = True
+            except Exception as e:
+                try:
+                    code = self._bridge.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    code = None
+                self.stop()
+                if code != BRIDGE_EXIT_NO_UNO:
+                    raise Exception(f"LibreOffice worker {self.index} did not start: {e}")
+                self._no_uno = True
+                logger.warning(
+                    f"{self.python} не может импортировать uno (python3-uno), "
+                    f"LibreOffice worker {self.index} запускает soffice на каждый документ"
+                )
+
+        self.started = True
+
+    def stop(self):
+        """Terminate bridge and soffice processes."""
+        self._forget_inherited()
+        self.started = False
+        self.resident = False
+        if self._bridge is not None:
+            try:
+                # Closing stdin makes the bridge terminate soffice and exit
+                self._bridge.stdin.close()
+                self._bridge.wait(timeout=5)
+            except Exception:
+                self._bridge.kill()
+                self._bridge.wait()
+            self._bridge = None
+
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def remove_profile(self):
+        """Delete the profile directory of this process; call after stop()."""
+        if self._pid == os.getpid() and self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def _forget_inherited(self):
+        # After a fork the processes belong to the parent: leave them alone
+        # and start our own under a new profile and pipe
+        if self._pid is not None and self._pid != os.getpid():
+            self._pid = None
+            self._process = None
+            self._bridge = None
+            self.started = False
+            self.resident = False
+
+    def is_healthy(self) -> bool:
+        """Check that the worker is started and soffice still answers."""
+        self._forget_inherited()
+        if not self.started:
+            return False
+        if not self.resident:
+            return shutil.which(self.binary) is not None
+        if self._process.poll() is not None or self._bridge.poll() is not None:
+            return False
+        try:
+            # Round-trip through the bridge to soffice
+            self._request({"op": "ping"})
+            return True
+        except Exception:
+            return False
+
+    def convert(self, docx_path: str, output_path: str):
+        """Convert one DOCX document to PDF."""
+        if self.resident:
+            self._request({"op": "convert", "src": docx_path, "dst": output_path})
+        else:
+            self._convert_subprocess(docx_path, output_path)
+        self.conversions += 1
+
+    def _request(self, payload: dict):
+        self._bridge.stdin.write(json.dumps(payload) + "\n")
+        self._bridge.stdin.flush()
+        self._read_reply()
+
+    def _read_reply(self):
+        # Bridge calls have no timeout of their own: kill both processes if
+        # soffice hangs, which ends the pending read and the pool restarts
+        # the worker
+        watchdog = threading.Timer(self.timeout, self._kill)
+        watchdog.start()
+        try:
+            line = self._bridge.stdout.readline()
+        finally:
+            watchdog.cancel()
+
+        if not line:
+            raise Exception(f"LibreOffice bridge of worker {self.index} exited")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise Exception(f"LibreOffice conversion failed: {reply.get('error')}")
+
+    def _kill(self):
+        for process in (self._bridge, self._process):
+            if process is not None:
+                process.kill()
+
+    def _convert_subprocess(self, docx_path: str, output_path: str):
+        out_dir = tempfile.mkdtemp(prefix="convert_", dir=self.profile_dir)
+        try:
+            result = subprocess.run(
+                [
+                    self.binary,
+                    '--headless',
+                    '--norestore',
+                    f'-env:UserInstallation={self.profile_url}',
+                    '--convert-to', 'pdf',
+                    '--outdir', out_dir,
+                    docx_path
+                ],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+
+            if result.returncode != 0:
+                raise Exception(f"LibreOffice conversion failed: {result.stderr}")
+
+            # LibreOffice creates PDF with same name as DOCX
+            produced = os.path.join(out_dir, Path(docx_path).stem + '.pdf')
+            if not os.path.exists(produced):
+                raise Exception(f"LibreOffice produced no output: {result.stderr}")
+            shutil.move(produced, output_path)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+class LibreOfficePool:
+    """
+    Pool of headless LibreOffice workers shared by all conversions in the process.
+
+    Workers are started lazily on first use, health-checked before every job
+    and restarted after ``max_conversions`` jobs or after a failure.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_conversions: int,
+        binary: str,
+        profile_root: str,
+        timeout: int,
+        python: Optional[str] = None
+    ):
+        self.size = max(1, size)
+        self.max_conversions = max_conversions
+        self.timeout = timeout
+        self._workers: List[LibreOfficeWorker] = [
+            LibreOfficeWorker(index, binary, profile_root, timeout, python)
+            for index in range(self.size)
+        ]
+        self._idle: "queue.Queue[LibreOfficeWorker]" = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def convert(self, docx_path: str, output_path: str) -> str:
+        """
+        Convert DOCX to PDF on the next free worker.
+
+        Args:
+            docx_path: Path to DOCX file
+            output_path: Path for output PDF
+
+        Returns:
+            Path to generated PDF
+        """
+        try:
+            worker = self._idle.get(timeout=self.timeout * self.size)
+        except queue.Empty:
+            raise Exception("No LibreOffice worker became available")
+
+        try:
+            # One retry on a fresh process covers crashes left by a previous job
+            for attempt in range(2):
+                if not worker.is_healthy():
+                    self._restart(worker)
+                try:
+                    worker.convert(docx_path, output_path)
+                    break
+                except Exception:
+                    self._stop(worker)
+                    if attempt == 1:
+                        raise
+
+            if worker.conversions >= self.max_conversions:
+                self._restart(worker)
+
+            return output_path
+        finally:
+            self._idle.put(worker)
+
+    def idle_count(self) -> int:
+        """Number of workers waiting for a job."""
+        return self._idle.qsize()
+
+    def shutdown(self):
+        """Stop all workers and remove their profiles."""
+        for worker in self._workers:
+            self._stop(worker)
+            worker.remove_profile()
+
+    def _restart(self, worker: LibreOfficeWorker):
+        if worker.profile_dir is None:
+            remove_stale_profiles(worker.profile_root)
+        logger.info(f"Перезапуск LibreOffice worker {worker.index}")
+        worker.restart()
+
+    def _stop(self, worker: LibreOfficeWorker):
+        try:
+            worker.stop()
+        except Exception as e:
+            logger.warning(f"Ошибка остановки LibreOffice worker {worker.index}: {e}")
+
+
+def remove_stale_profiles(profile_root: str):
+    """Delete profile directories left by processes that are gone."""
+    try:
+        names = os.listdir(profile_root)
+    except FileNotFoundError:
+        return
+    for name in names:
+        pid, _, rest = name.partition("_")
+        if not pid.isdigit() or not rest.startswith("worker_"):
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            shutil.rmtree(os.path.join(profile_root, name), ignore_errors=True)
+        except PermissionError:
+            pass  # alive, owned by another user
+
+
+libreoffice_pool = LibreOfficePool(
+    size=settings.LIBREOFFICE_POOL_SIZE,
+    max_conversions=settings.LIBREOFFICE_MAX_CONVERSIONS,
+    binary=settings.LIBREOFFICE_BINARY,
+    profile_root=settings.LIBREOFFICE_PROFILE_DIR or os.path.join(
+        tempfile.gettempdir(), "autoredactor-libreoffice"
+    ),
+    timeout=settings.LIBREOFFICE_TIMEOUT,
+    python=settings.LIBREOFFICE_PYTHON
+)
@@ -0,0 +1,146 @@
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.models.article import ArticleMetadata
+
+logger = logging.getLogger("autoredactor")
+
+
+class MetadataCache:
+    """
+    Two-tier cache of AI-extracted article metadata.
+
+    The front tier is an in-process LRU with TTL. The back tier is Redis,
+    shared by all processes, with the same TTL and a sorted-set index that
+    caps the number of entries. Redis errors degrade to memory-only caching.
+    """
+
+    KEY_PREFIX = "metadata:"
+    INDEX_KEY = "metadata:index"
+
+    def __init__(
+        self,
+        backend: str,
+        redis_url: str,
+        ttl_seconds: int,
+        memory_entries: int,
+        redis_entries: int
+    ):
+        self.backend = backend
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.redis_entries = redis_entries
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[float, ArticleMetadata]]" = OrderedDict()
+        self._redis: Optional[aioredis.Redis] = None
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt_version: str) -> str:
+        """
+        Compute cache key.
+
+        Args:
+            text: Text prefix sent to the model
+            model: Model name
+            prompt_version: Version of the extraction prompt
+
+        Returns:
+            Hex digest identifying the extraction
+        """
+        digest = hashlib.sha256()
+        for part in (prompt_version, model, text):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[ArticleMetadata]:
+        """Look up metadata, memory tier first."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, metadata = entry
+            if expires_at > time.time():
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return metadata
+            del self._memory[key]
+
+        client = self._client()
+        if client is not None:
+            try:
+                raw = await client.get(self.KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"Кэш метаданных: Redis недоступен: {e}")
+                raw = None
+            if raw is not None:
+                metadata = ArticleMetadata.model_validate_json(raw)
+                self._remember(key, metadata)
+                self.redis_hits += 1
+                return metadata
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, metadata: ArticleMetadata):
+        """Store metadata in both tiers."""
+        self._remember(key, metadata)
+
+        client = self._client()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(self.KEY_PREFIX + key, metadata.model_dump_json(), ex=self.ttl_seconds)
+                pipe.zadd(self.INDEX_KEY, {key: time.time()})
+                pipe.zcard(self.INDEX_KEY)
+                _, _, size = await pipe.execute()
+
+            if size > self.redis_entries:
+                oldest = await client.zpopmin(self.INDEX_KEY, size - self.redis_entries)
+                if oldest:
+                    await client.delete(*[self.KEY_PREFIX + k.decode() for k, _ in oldest])
+        except Exception as e:
+            logger.warning(f"Кэш метаданных: Redis недоступен: {e}")
+
+    async def aclose(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, key: str, metadata: ArticleMetadata):
+        self._memory[key] = (time.time() + self.ttl_seconds, metadata)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _client(self) -> Optional[aioredis.Redis]:
+        if self.backend != "redis":
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, socket_connect_timeout=2)
+        return self._redis
+
+
+metadata_cache = MetadataCache(
+    backend=settings.METADATA_CACHE_BACKEND,
+    redis_url=settings.REDIS_URL,
+    ttl_seconds=settings.METADATA_CACHE_TTL_HOURS * 3600,
+    memory_entries=settings.METADATA_CACHE_MEMORY_ENTRIES,
+    redis_entries=settings.METADATA_CACHE_REDIS_ENTRIES
+)
@@ -0,0 +1,273 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import String, and_, cast, func, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.models import Article
+from app.models.article import ArticleMetadata, ArticleResponse
+from app.services.ai_extractor import AIExtractor
+from app.services.ai_scheduler import Priority
+from app.services.docx_parser import DocxParser
+from app.services.docx_head_reader import DocxHeadReader, DocumentStatistics
+from app.services.heuristic_extractor import HeuristicExtractor
+from app.services.progress_bus import publish_article_update
+
+logger = logging.getLogger("autoredactor")
+
+# Stored head is enough for the article preview (first 500 words)
+TEXT_HEAD_CHARS = 3000
+
+# First key of the advisory locks taken on articles being extracted
+METADATA_LOCK_NAMESPACE = 0x4D44
+
+docx_parser = DocxParser()
+heuristic_extractor = HeuristicExtractor(docx_parser)
+ai_extractor = AIExtractor()
+
+
+class MetadataWorker:
+    """
+    Background metadata extraction for uploaded articles.
+
+    Upload endpoints store the file, insert the article with
+    ``metadata_status='pending'`` and enqueue its id. Workers drain the queue
+    in batches: document statistics are read and the heuristic extractor
+    runs first, articles it is not sure about go to the AI in batched
+    requests, then the rows are updated and
+    subscribers of the session channel are notified. Title, author and
+    language edited by hand before extraction finishes are kept; the
+    other fields are still filled in. Statistics are written whatever the
+    metadata status. Articles still pending or without statistics at
+    startup (lost on restart) are queued again with background priority.
+
+    Every replica requeues pending articles, so an article is claimed with
+    a transaction-level advisory lock before extraction: replicas skip
+    articles locked by another one, and the lock is released with the
+    transaction, also when the process dies. A batch that fails is marked
+    'error' so it does not stay pending forever.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, workers: int, batch_size: int):
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.processed = 0
+        self.failed = 0
+        self._queue: Optional["asyncio.Queue[Tuple[UUID, Priority]]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start workers and requeue articles left pending."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        await self._requeue_pending()
+
+    async def stop(self):
+        """Stop workers; unfinished articles stay pending until next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, article_id: UUID, priority: Priority = Priority.INTERACTIVE):
+        """Schedule metadata extraction of a committed article."""
+        if self._queue is None:
+            logger.warning(f"Обработчик метаданных не запущен, статья {article_id} ждёт перезапуска")
+            return
+        self._queue.put_nowait((article_id, priority))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+    async def _requeue_pending(self):
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(Article.id)
+                    .where(_unprocessed())
+                    .order_by(Article.created_at)
+                )
+                article_ids = result.scalars().all()
+        except Exception as e:
+            logger.warning(f"Не удалось найти статьи без метаданных: {e}")
+            return
+
+        for article_id in article_ids:
+            self.enqueue(article_id, Priority.BACKGROUND)
+        if article_ids:
+            logger.info(f"Возобновлено извлечение метаданных для {len(article_ids)} статей")
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._process(batch)
+            except Exception as e:
+                logger.error(f"Ошибка извлечения метаданных: {e}")
+                await self._fail([article_id for article_id, _ in batch])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _process(self, batch: List[Tuple[UUID, Priority]]):
+        article_ids = [article_id for article_id, _ in batch]
+        priority = min(priority for _, priority in batch)
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Article.id, _claim(Article.id)).where(
+                    Article.id.in_(article_ids),
+                    _unprocessed()
+                )
+            )
+            claimed = [article_id for article_id, locked in result.all() if locked]
+            if not claimed:
+                return
+            # Another replica may have finished an article before we locked it
+            result = await session.execute(
+                select(Article.id, Article.file_path, Article.metadata_status).where(
+                    Article.id.in_(claimed),
+                    _unprocessed()
+                )
+            )
+            rows = result.all()
+            if not rows:
+                return
+
+            extracted = await asyncio.gather(*[
+                asyncio.to_thread(extract_locally, file_path, status == "pending")
+                for _, file_path, status in rows
+            ])
+            uncertain = [data for _, data in filter(None, extracted) if isinstance(data, str)]
+            ai_metadata = iter(await ai_extractor.extract_metadata_batch(uncertain, priority))
+
+            for (article_id, _, _), result in zip(rows, extracted):
+                if result is None:
+                    self.failed += 1
+                    await session.execute(
+                        update(Article)
+                        .where(Article.id == article_id, Article.metadata_status == "pending")
+                        .values(metadata_status="error")
+                    )
+                    continue
+
+                statistics, data = result
+                self.processed += 1
+                await session.execute(
+                    update(Article)
+                    .where(Article.id == article_id)
+                    .values(**statistics._asdict())
+                )
+                if data is None:
+                    continue
+                metadata = next(ai_metadata) if isinstance(data, str) else data
+                # Fields edited by hand (set while pending) win over extracted values
+                await session.execute(
+                    update(Article)
+                    .where(Article.id == article_id, Article.metadata_status == "pending")
+                    .values(
+                        title=func.coalesce(Article.title, metadata.title),
+                        author=func.coalesce(Article.author, metadata.author),
+                        language=func.coalesce(Article.language, metadata.language),
+                        ai_confidence=metadata.confidence,
+                        metadata_status="ready"
+                    )
+                )
+            await session.commit()
+
+            result = await session.execute(
+                select(Article).where(Article.id.in_([article_id for article_id, _, _ in rows]))
+            )
+            articles = result.scalars().all()
+
+        for article in articles:
+            await publish_article_update(
+                ArticleResponse.model_validate(article).model_dump(mode="json")
+            )
+
+    async def _fail(self, article_ids: List[UUID]):
+        """Mark pending articles of a failed batch as errors."""
+        try:
+            async with self.session_factory() as session:
+                # Articles claimed by another replica are left to it
+                result = await session.execute(
+                    update(Article)
+                    .where(
+                        Article.id.in_(article_ids),
+                        Article.metadata_status == "pending",
+                        _claim(Article.id)
+                    )
+                    .values(metadata_status="error")
+                    .returning(Article)
+                )
+                articles = result.scalars().all()
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Не удалось отметить ошибку извлечения метаданных: {e}")
+            return
+
+        self.failed += len(articles)
+        for article in articles:
+            await publish_article_update(
+                ArticleResponse.model_validate(article).model_dump(mode="json")
+            )
+
+
+def _claim(article_id):
+    """Try to lock an article until the end of the transaction."""
+    return func.pg_try_advisory_xact_lock(
+        METADATA_LOCK_NAMESPACE, func.hashtext(cast(article_id, String))
+    )
+
+
+def _unprocessed():
+    """Articles waiting for metadata, or readable ones without statistics."""
+    return or_(
+        Article.metadata_status == "pending",
+        and_(Article.word_count.is_(None), Article.metadata_status.is_distinct_from("error"))
+    )
+
+
+def extract_locally(
+    file_path: str,
+    with_metadata: bool = True
+) -> Optional[Tuple[DocumentStatistics, Union[ArticleMetadata, str, None]]]:
+    """
+    Read document statistics and extract metadata locally.
+
+    Returns statistics with confident heuristic metadata, otherwise with
+    text for AI, or with None when metadata is not wanted; None if the
+    file is not a valid DOCX.
+    """
+    try:
+        # Reading fails on broken documents, no separate validation pass
+        statistics = DocxHeadReader.read_statistics(file_path, head_chars=TEXT_HEAD_CHARS)
+        if not with_metadata:
+            return statistics, None
+        metadata = heuristic_extractor.extract(file_path)
+        if metadata.confidence >= settings.HEURISTIC_CONFIDENCE_THRESHOLD:
+            return statistics, metadata
+        return statistics, statistics.text_head[:2000]
+    except Exception:
+        return None
+
+
+metadata_worker = MetadataWorker(
+    session_factory=AsyncSessionLocal,
+    workers=settings.METADATA_WORKERS,
+    batch_size=settings.AI_BATCH_SIZE
+)
@@ -1,26 +1,220 @@
 import os
-import subprocess
-from typing import List, Optional
-from PyPDF2 import PdfReader, PdfWriter
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from PyPDF2 import PdfReader, PdfWriter, PageObject
+from PyPDF2.generic import (
+    ArrayObject, BooleanObject, DecodedStreamObject, DictionaryObject, IndirectObject,
+    NameObject, NumberObject, RectangleObject
+)
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from io import BytesIO
+
+from app.core.config import settings
+from app.services.libreoffice_pool import LibreOfficePool, libreoffice_pool
+from app.services.conversion_cache import ConversionCache, conversion_cache
+
+logger = logging.getLogger("autoredactor")
+
+# Bump whenever create_toc_pdf output changes; build manifests key TOCs by it
+TOC_LAYOUT_VERSION = "2"
+
+TEXT_FONT = "JournalSans"
+TEXT_FONT_BOLD = "JournalSans-Bold"
+
+# Private key marking links added by assemble_pdf; they are re-created on
+# every build, so reused pages drop them
+ASSEMBLER_LINK = "/AR_TocLink"
+# Keys not copied when a source document link is re-created in the output
+LINK_COPY_EXCLUDED = ("/Dest", "/A", "/P", "/Parent", "/Popup", "/StructParent")
+
+
+class BlankPages(NamedTuple):
+    """Part of an assembled PDF made of blank pages, created in memory."""
+    count: int
+    page_size: Tuple[float, float] = A4
+
+
+class ReusedPages(NamedTuple):
+    """Part of an assembled PDF copied from an earlier output, already numbered."""
+    pdf_path: str
+    first_page: int  # zero-based index in pdf_path
+    count: int
+
+
+class ReusedPagesError(Exception):
+    """The earlier output of a ReusedPages part cannot be read."""
+
+
+class MissingPartError(Exception):
+    """A PDF file part of assemble_pdf does not exist."""
+
+    def __init__(self, path: str):
+        super().__init__(f"PDF part not found: {path}")
+        self.path = path
+
+
+class OutlineItem(NamedTuple):
+    """Bookmark of an assembled PDF."""
+    title: str
+    page: int  # zero-based page of the output
+    children: Tuple["OutlineItem", ...] = ()
+
+
+class PageLink(NamedTuple):
+    """Clickable area of an assembled PDF that jumps to another of its pages."""
+    page: int  # zero-based page holding the link
+    rect: Tuple[float, float, float, float]
+    target: int  # zero-based page to jump to
+
+
+class TocLine(NamedTuple):
+    """One TOC entry placed on a TOC page."""
+    entry: int  # index in toc_entries
+    page: int  # zero-based TOC page
+    lines: List[str]  # wrapped text, the last line ends with the leader
+    baseline: float  # baseline of the first line
+    rect: Tuple[float, float, float, float]  # area of the entry: x1, y1, x2, y2
+
+
+class TocLayout(NamedTuple):
+    """Table of contents laid out on pages, ready to be drawn."""
+    page_size: Tuple[float, float]
+    pages: List[List[TocLine]]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+
+def register_fonts() -> Tuple[str, str]:
+    """
+    Register the Unicode TTF fonts for generated pages, once per process.
+
+    Returns:
+        (regular, bold) font names; Helvetica if the fonts are missing,
+        which cannot render Cyrillic
+    """
+    registered = pdfmetrics.getRegisteredFontNames()
+    if TEXT_FONT in registered:
+        return TEXT_FONT, TEXT_FONT_BOLD if TEXT_FONT_BOLD in registered else TEXT_FONT
+
+    try:
+        pdfmetrics.registerFont(TTFont(TEXT_FONT, settings.PDF_FONT_PATH))
+    except Exception as e:
+        logger.warning(f"Шрифт {settings.PDF_FONT_PATH} не загружен, используется Helvetica: {e}")
+        return "Helvetica", "Helvetica-Bold"
+
+    try:
+        pdfmetrics.registerFont(TTFont(TEXT_FONT_BOLD, settings.PDF_FONT_BOLD_PATH))
+        return TEXT_FONT, TEXT_FONT_BOLD
+    except Exception as e:
+        logger.warning(f"Шрифт {settings.PDF_FONT_BOLD_PATH} не загружен: {e}")
+        return TEXT_FONT, TEXT_FONT
+
+
+class PageNumberStamper:
+    """
+    Stamps page numbers onto pages of a PdfWriter.
+
+    The font resource and the graphics-state prologue are added to the writer
+    once and shared by every page. The stamp position is computed once per
+    distinct page size, so numbering a page only appends a few bytes of
+    content stream instead of rendering and parsing an overlay PDF.
+    """
+
+    FONT_NAME = "Helvetica"
+    FONT_SIZE = 12
+    FONT_RESOURCE = "/FPageNum"
+
+    def __init__(self, writer: PdfWriter):
+        self.writer = writer
+        self._font_ref = writer._add_object(DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject(f"/{self.FONT_NAME}"),
+            NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+        }))
+        # Isolate the original content so its graphics state cannot leak into the stamp
+        self._save_state_ref = self._add_stream(b"q\n")
+        self._digit_width = pdfmetrics.stringWidth("0", self.FONT_NAME, self.FONT_SIZE)
+        self._positions: Dict[Tuple[float, float, float, float], Tuple[float, float]] = {}
+
+    def stamp(self, page: PageObject, page_num: int):
+        """
+        Draw page number centred at the bottom of the page.
+
+        Args:
+            page: Page that already belongs to the writer
+            page_num: Number to draw
+        """
+        center_x, baseline = self._position(page)
+        text = str(page_num)
+        x = center_x - len(text) * self._digit_width / 2
+
+        number_ref = self._add_stream(
+            f"Q BT {self.FONT_RESOURCE} {self.FONT_SIZE} Tf "
+            f"{x:.2f} {baseline:.2f} Td ({text}) Tj ET\n".encode()
+        )
+
+        self._add_font_resource(page)
+
+        contents = page.get("/Contents")
+        if contents is None:
+            original = []
+        elif isinstance(contents.get_object(), ArrayObject):
+            original = list(contents.get_object())
+        else:
+            original = [contents]
+        page[NameObject("/Contents")] = ArrayObject(
+            [self._save_state_ref, *original, number_ref]
+        )
+
+    def _position(self, page: PageObject) -> Tuple[float, float]:
+        box = page.mediabox
+        key = (float(box.left), float(box.bottom), float(box.right), float(box.top))
+        position = self._positions.get(key)
+        if position is None:
+            left, bottom, right, _ = key
+            position = ((left + right) / 2, bottom + 1.5 * cm)
+            self._positions[key] = position
+        return position
+
+    def _add_font_resource(self, page: PageObject):
+        if "/Resources" not in page:
+            page[NameObject("/Resources")] = DictionaryObject()
+        resources = page["/Resources"].get_object()
+
+        if "/Font" not in resources:
+            resources[NameObject("/Font")] = DictionaryObject()
+        fonts = resources["/Font"].get_object()
+        fonts[NameObject(self.FONT_RESOURCE)] = self._font_ref
+
+    def _add_stream(self, data: bytes):
+        stream = DecodedStreamObject()
+        stream.set_data(data)
+        return self.writer._add_object(stream)
 
 
 class PDFGenerator:
     """Service for generating and manipulating PDF files."""
 
-    def __init__(self):
-        # Register fonts for cyrillic support
-        # Note: In production, you'd need to include actual font files
-        pass
+    def __init__(
+        self,
+        pool: Optional[LibreOfficePool] = None,
+        cache: Optional[ConversionCache] = None
+    ):
+        # Unicode fonts for Cyrillic and Kazakh text on generated pages
+        self.font, self.bold_font = register_fonts()
+        self.pool = pool or libreoffice_pool
+        self.cache = cache or conversion_cache
+        self._blank_pages: Dict[Tuple[float, float], PageObject] = {}
 
     def docx_to_pdf(self, docx_path: str, output_path: str) -> str:
         """
-        Convert DOCX to PDF using LibreOffice (headless).
+        Convert DOCX to PDF on the shared headless LibreOffice pool.
 
         Args:
             docx_path: Path to DOCX file
@@ -30,34 +224,43 @@ class PDFGenerator:
             Path to generated PDF
         """
         try:
-            # Using LibreOffice for conversion
-            # Install with: apt-get install libreoffice
-            output_dir = os.path.dirname(output_path)
-            result = subprocess.run(
-                [
-                    'libreoffice',
-                    '--headless',
-                    '--convert-to', 'pdf',
-                    '--outdir', output_dir,
-                    docx_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode != 0:
-                raise Exception(f"LibreOffice conversion failed: {result.stderr}")
-
-            # LibreOffice creates PDF with same name as DOCX
-            expected_pdf = docx_path.replace('.docx', '.pdf')
-            if os.path.exists(expected_pdf) and expected_pdf != output_path:
-                os.rename(expected_pdf, output_path)
-
-            return output_path
+            return self.pool.convert(docx_path, output_path)
         except Exception as e:
             raise Exception(f"Error converting DOCX to PDF: {str(e)}")
 
+    def docx_to_pdf_cached(
+        self,
+        docx_path: str,
+        fingerprint: str = "",
+        content_hash: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """
+        Convert DOCX to PDF through the content-addressed conversion cache.
+
+        Args:
+            docx_path: Path to DOCX file
+            fingerprint: Page-format fingerprint of the build
+            content_hash: Known SHA-256 of the DOCX (stored at upload)
+
+        Returns:
+            (pdf_path, page_count). The PDF is owned by the cache and must
+            not be deleted by the caller.
+        """
+        key = self.cache.make_key(docx_path, fingerprint, content_hash)
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+
+        tmp_pdf = self.cache.temp_path()
+        try:
+            self.docx_to_pdf(docx_path, tmp_pdf)
+            pages = self.get_pdf_page_count(tmp_pdf)
+            return self.cache.put(key, tmp_pdf, pages), pages
+        except Exception:
+            if os.path.exists(tmp_pdf):
+                os.remove(tmp_pdf)
+            raise
+
     def get_pdf_page_count(self, pdf_path: str) -> int:
         """
         Get number of pages in PDF.
@@ -74,90 +277,303 @@ class PDFGenerator:
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
 
-    def add_blank_pages(self, count: int, output_path: str, page_size=A4):
-        """
-        Create PDF with blank pages.
-
-        Args:
-            count: Number of blank pages
-            output_path: Path for output PDF
-            page_size: Page size tuple
+    def assemble_pdf(
+        self,
+        parts: List[Union[str, BlankPages, ReusedPages]],
+        output_path: str,
+        start_page: int = 1,
+        outline: Optional[List[OutlineItem]] = None,
+        links: Optional[List[PageLink]] = None
+    ) -> int:
         """
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=page_size)
-
-        for _ in range(count):
-            c.showPage()
+        Merge PDFs into one file and number pages in the same pass.
 
-        c.save()
-        buffer.seek(0)
+        Pages are stamped as they are appended, so the result is written
+        straight to output_path without an intermediate merged file.
+        BlankPages parts are appended from an in-memory page without
+        touching the disk. ReusedPages parts are copied from an earlier
+        output as they are, their numbers already match; the links that
+        output got from ``links`` are dropped from them.
 
-        with open(output_path, 'wb') as f:
-            f.write(buffer.read())
-
-    def merge_pdfs(self, pdf_paths: List[str], output_path: str) -> str:
-        """
-        Merge multiple PDFs into one.
+        Links between pages of a source document (footnotes, cross
+        references) are re-created against the output pages; links to
+        pages that are not part of the output are dropped.
 
         Args:
-            pdf_paths: List of PDF file paths
-            output_path: Path for merged PDF
+            parts: List of PDF file paths, BlankPages and ReusedPages
+            output_path: Path for output PDF
+            start_page: Starting page number
+            outline: Bookmarks; the PDF opens with the outline shown
+            links: Internal links to add
 
         Returns:
-            Path to merged PDF
+            Number of pages written
+
+        Raises:
+            ReusedPagesError: Earlier output of a ReusedPages part is gone
+            MissingPartError: A PDF file part does not exist, e.g. it was
+                evicted from the conversion cache
         """
         try:
             writer = PdfWriter()
-
-            for pdf_path in pdf_paths:
-                if os.path.exists(pdf_path):
-                    reader = PdfReader(pdf_path)
-                    for page in reader.pages:
-                        writer.add_page(page)
+            stamper = PageNumberStamper(writer)
+            page_num = start_page
+            readers: Dict[str, PdfReader] = {}
+            # Output page of every source page, by (reader, page object number)
+            output_pages: Dict[Tuple[int, int], int] = {}
+            source_links: List[Tuple[int, int, DictionaryObject, int, list]] = []
+
+            def add_page(reader: PdfReader, page: PageObject) -> PageObject:
+                index = len(writer.pages)
+                output_pages[id(reader), page.indirect_reference.idnum] = index
+                for annotation, target, view in self._take_internal_links(page):
+                    source_links.append((index, id(reader), annotation, target, view))
+                return writer.add_page(page)
+
+            for part in parts:
+                if isinstance(part, ReusedPages):
+                    try:
+                        reader = readers.get(part.pdf_path)
+                        if reader is None:
+                            reader = readers[part.pdf_path] = PdfReader(part.pdf_path)
+                        pages = [
+                            reader.pages[index]
+                            for index in range(part.first_page, part.first_page + part.count)
+                        ]
+                    except Exception as e:
+                        raise ReusedPagesError(f"{part.pdf_path}: {str(e)}")
+                    for page in pages:
+                        add_page(reader, page)
+                    page_num += part.count
+                    continue
+
+                if isinstance(part, BlankPages):
+                    blank = self._blank_page(part.page_size)
+                    for _ in range(part.count):
+                        stamper.stamp(writer.add_page(blank), page_num)
+                        page_num += 1
+                    continue
+
+                try:
+                    reader = PdfReader(part)
+                except FileNotFoundError:
+                    # Skipping it would shift every page after it
+                    raise MissingPartError(part)
+                for page in reader.pages:
+                    stamper.stamp(add_page(reader, page), page_num)
+                    page_num += 1
+
+            for index, reader_id, annotation, target, view in source_links:
+                target_index = output_pages.get((reader_id, target))
+                if target_index is not None:
+                    self._copy_link(writer, index, annotation, target_index, view)
+            for link in links or []:
+                self._add_link(writer, link)
+            if outline:
+                self._add_outline(writer, outline)
+                writer.page_mode = "/UseOutlines"
 
             with open(output_path, 'wb') as output_file:
                 writer.write(output_file)
 
-            return output_path
+            return page_num - start_page
+        except (ReusedPagesError, MissingPartError):
+            raise
         except Exception as e:
-            raise Exception(f"Error merging PDFs: {str(e)}")
-
-    def add_page_numbers(self, pdf_path: str, output_path: str, start_page: int = 1):
+            raise Exception(f"Error assembling PDF: {str(e)}")
+
+    @staticmethod
+    def _add_outline(writer: PdfWriter, items: List[OutlineItem], parent=None):
+        for item in items:
+            bookmark = writer.add_outline_item(item.title, item.page, parent=parent)
+            PDFGenerator._add_outline(writer, list(item.children), bookmark)
+
+    @staticmethod
+    def _add_link(writer: PdfWriter, link: PageLink):
+        # PdfWriter.add_annotation writes the target as a page index, which is
+        # only valid for links into other documents; refer to the page object
+        page = writer.pages[link.page]
+        PDFGenerator._append_annotation(writer, page, DictionaryObject({
+            NameObject("/Type"): NameObject("/Annot"),
+            NameObject("/Subtype"): NameObject("/Link"),
+            NameObject("/Rect"): RectangleObject(link.rect),
+            NameObject("/Border"): ArrayObject([NumberObject(0)] * 3),
+            NameObject("/P"): page.indirect_reference,
+            NameObject("/Dest"): ArrayObject([
+                writer.pages[link.target].indirect_reference, NameObject("/Fit")
+            ]),
+            NameObject(ASSEMBLER_LINK): BooleanObject(True),
+        }))
+
+    @staticmethod
+    def _copy_link(
+        writer: PdfWriter,
+        page_index: int,
+        annotation: DictionaryObject,
+        target: int,
+        view: list
+    ):
+        page = writer.pages[page_index]
+        copied = DictionaryObject({
+            NameObject(key): value.clone(writer)
+            for key, value in annotation.items()
+            if key not in LINK_COPY_EXCLUDED
+        })
+        copied[NameObject("/P")] = page.indirect_reference
+        copied[NameObject("/Dest")] = ArrayObject(
+            [writer.pages[target].indirect_reference] + [value.clone(writer) for value in view]
+        )
+        PDFGenerator._append_annotation(writer, page, copied)
+
+    @staticmethod
+    def _append_annotation(writer: PdfWriter, page: PageObject, annotation: DictionaryObject):
+        reference = writer._add_object(annotation)
+        if "/Annots" not in page:
+            page[NameObject("/Annots")] = ArrayObject()
+        page["/Annots"].get_object().append(reference)
+
+    @staticmethod
+    def _take_internal_links(page: PageObject) -> List[Tuple[DictionaryObject, int, list]]:
         """
-        Add page numbers to PDF.
+        Remove links to other pages of the source document from a page.
 
-        Args:
-            pdf_path: Path to input PDF
-            output_path: Path for output PDF
-            start_page: Starting page number
+        PdfWriter would copy their targets as detached page objects, so the
+        links are re-created once the output pages exist. Links added by
+        assemble_pdf are dropped, the rest are returned as (annotation,
+        target page object number, view after the page in the destination).
+        Named destinations are left as they are.
         """
-        try:
-            reader = PdfReader(pdf_path)
-            writer = PdfWriter()
-
-            for i, page in enumerate(reader.pages):
-                page_num = start_page + i
-
-                # Create overlay with page number
-                packet = BytesIO()
-                can = canvas.Canvas(packet, pagesize=A4)
-                can.drawString(A4[0] / 2, 1.5 * cm, str(page_num))
-                can.save()
-
-                packet.seek(0)
-                overlay = PdfReader(packet)
+        annotations = page.get("/Annots")
+        if annotations is None:
+            return []
+        kept = ArrayObject()
+        taken = []
+        for annotation in annotations.get_object():
+            link = annotation.get_object()
+            if link.get("/Subtype") != "/Link":
+                kept.append(annotation)
+                continue
+            if ASSEMBLER_LINK in link:
+                continue
+            destination = link.get("/Dest")
+            action = link.get("/A")
+            if destination is None and action is not None and action.get_object().get("/S") == "/GoTo":
+                destination = action.get_object().get("/D")
+            destination = destination.get_object() if destination is not None else None
+            if (
+                isinstance(destination, ArrayObject)
+                and destination
+                and isinstance(destination[0], IndirectObject)
+            ):
+                taken.append((link, destination[0].idnum, list(destination[1:])))
+            else:
+                kept.append(annotation)
+        page[NameObject("/Annots")] = kept
+        return taken
+
+    def _blank_page(self, page_size: Tuple[float, float]) -> PageObject:
+        """Blank page template, created once per page size."""
+        page = self._blank_pages.get(page_size)
+        if page is None:
+            width, height = page_size
+            page = PageObject.create_blank_page(None, round(width, 4), round(height, 4))
+            self._blank_pages[page_size] = page
+        return page
+
+    # Table of contents geometry
+    TOC_MARGIN = 2 * cm
+    TOC_TOP = 3 * cm  # first baseline below the top edge
+    TOC_BOTTOM = 3 * cm  # no baseline below this
+    TOC_HEADING = "СОДЕРЖАНИЕ"
+    TOC_HEADING_SIZE = 16
+    TOC_HEADING_SPACE = 2 * cm  # from the heading to the first entry
+    TOC_FONT_SIZE = 10
+    TOC_LINE_HEIGHT = 0.5 * cm
+    TOC_ENTRY_SPACE = 0.2 * cm
+    TOC_NUMBER_DIGITS = "0000"  # widest page number the column is sized for
+    TOC_LEADER = " ."
+
+    def layout_toc(self, toc_entries: List[dict], page_size=A4) -> TocLayout:
+        """
+        Lay out the table of contents without drawing it.
 
-                # Merge overlay with original page
-                page.merge_page(overlay.pages[0])
-                writer.add_page(page)
+        Entry text is measured with the TOC font and wrapped to the width
+        left of the page number column; an entry is never split between
+        pages. The number column has a fixed width, so the layout does not
+        depend on page numbers: its page count is known before the pages
+        of the journal are, and stays the same once they are filled in.
 
-            with open(output_path, 'wb') as output_file:
-                writer.write(output_file)
-
-        except Exception as e:
-            raise Exception(f"Error adding page numbers: {str(e)}")
+        Args:
+            toc_entries: List of {'title': str, 'author': str, 'page': int};
+                'page' may be missing
+            page_size: Page size tuple
 
-    def create_toc_pdf(self, toc_entries: List[dict], output_path: str, page_size=A4):
+        Returns:
+            TocLayout
+        """
+        width, height = page_size
+        number_width = pdfmetrics.stringWidth(self.TOC_NUMBER_DIGITS, self.font, self.TOC_FONT_SIZE)
+        leader_width = pdfmetrics.stringWidth(self.TOC_LEADER * 3, self.font, self.TOC_FONT_SIZE)
+        text_width = width - 2 * self.TOC_MARGIN - number_width - leader_width
+
+        pages: List[List[TocLine]] = [[]]
+        y = height - self.TOC_TOP - self.TOC_HEADING_SPACE
+
+        for index, entry in enumerate(toc_entries):
+            # Initials already end with a period
+            lines = self._wrap(f"{entry['author'].rstrip('.')}. {entry['title']}", text_width)
+            entry_height = (len(lines) - 1) * self.TOC_LINE_HEIGHT
+            if y - entry_height < self.TOC_BOTTOM and pages[-1]:
+                pages.append([])
+                y = height - self.TOC_TOP
+
+            bottom = y - entry_height
+            pages[-1].append(TocLine(
+                entry=index,
+                page=len(pages) - 1,
+                lines=lines,
+                baseline=y,
+                rect=(
+                    self.TOC_MARGIN,
+                    bottom - self.TOC_FONT_SIZE * 0.3,
+                    width - self.TOC_MARGIN,
+                    y + self.TOC_FONT_SIZE
+                )
+            ))
+            y = bottom - self.TOC_LINE_HEIGHT - self.TOC_ENTRY_SPACE
+
+        return TocLayout(page_size, pages)
+
+    def _wrap(self, text: str, max_width: float) -> List[str]:
+        """Split text into lines not wider than max_width."""
+        lines = []
+        line = ""
+        for word in text.split():
+            candidate = f"{line} {word}" if line else word
+            if pdfmetrics.stringWidth(candidate, self.font, self.TOC_FONT_SIZE) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # A word longer than the line is broken by characters
+            while pdfmetrics.stringWidth(word, self.font, self.TOC_FONT_SIZE) > max_width:
+                cut = len(word) - 1
+                while cut > 1 and pdfmetrics.stringWidth(word[:cut], self.font, self.TOC_FONT_SIZE) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        if line or not lines:
+            lines.append(line)
+        return lines
+
+    def create_toc_pdf(
+        self,
+        toc_entries: List[dict],
+        output_path: str,
+        page_size=A4,
+        layout: Optional[TocLayout] = None
+    ) -> TocLayout:
         """
         Create table of contents PDF.
 
@@ -165,36 +581,46 @@ class PDFGenerator:
             toc_entries: List of {'title': str, 'author': str, 'page': int}
             output_path: Path for output PDF
             page_size: Page size tuple
+            layout: Result of layout_toc for the same entries, if already known
+
+        Returns:
+            Layout the PDF was drawn from
         """
         try:
-            c = canvas.Canvas(output_path, pagesize=page_size)
-            width, height = page_size
-
-            # Title
-            c.setFont("Helvetica-Bold", 16)
-            c.drawString(2 * cm, height - 3 * cm, "СОДЕРЖАНИЕ")
-
-            # Entries
-            c.setFont("Helvetica", 10)
-            y_position = height - 5 * cm
-
-            for entry in toc_entries:
-                if y_position < 3 * cm:
-                    c.showPage()
-                    y_position = height - 3 * cm
-
-                # Author and title
-                text = f"{entry['author']}. {entry['title']}"
-                page_num = str(entry['page'])
-
-                # Draw text
-                c.drawString(2 * cm, y_position, text[:80])
-
-                # Draw page number (right-aligned)
-                c.drawRightString(width - 2 * cm, y_position, page_num)
-
-                y_position -= 0.7 * cm
+            layout = layout or self.layout_toc(toc_entries, page_size)
+            width, height = layout.page_size
+            number_x = width - self.TOC_MARGIN
+            number_width = pdfmetrics.stringWidth(self.TOC_NUMBER_DIGITS, self.font, self.TOC_FONT_SIZE)
+            leader_end = number_x - number_width
+            leader_step = pdfmetrics.stringWidth(self.TOC_LEADER, self.font, self.TOC_FONT_SIZE)
+
+            c = canvas.Canvas(output_path, pagesize=layout.page_size)
+            for page_index, page in enumerate(layout.pages):
+                if page_index == 0:
+                    c.setFont(self.bold_font, self.TOC_HEADING_SIZE)
+                    c.drawString(self.TOC_MARGIN, height - self.TOC_TOP, self.TOC_HEADING)
+
+                c.setFont(self.font, self.TOC_FONT_SIZE)
+                for line in page:
+                    y = line.baseline
+                    for text in line.lines:
+                        c.drawString(self.TOC_MARGIN, y, text)
+                        y -= self.TOC_LINE_HEIGHT
+                    y += self.TOC_LINE_HEIGHT
+
+                    # Dot leader from the end of the text to the page number;
+                    # right-aligned, so dots line up across entries
+                    text_end = self.TOC_MARGIN + pdfmetrics.stringWidth(
+                        line.lines[-1], self.font, self.TOC_FONT_SIZE
+                    )
+                    dots = int((leader_end - text_end) / leader_step)
+                    if dots > 0:
+                        c.drawRightString(leader_end, y, self.TOC_LEADER * dots)
+
+                    c.drawRightString(number_x, y, str(toc_entries[line.entry]['page']))
+                c.showPage()
 
             c.save()
+            return layout
         except Exception as e:
             raise Exception(f"Error creating TOC: {str(e)}")
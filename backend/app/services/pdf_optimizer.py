@@ -0,0 +1,180 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import Dict, NamedTuple, Optional
+
+from app.core.config import settings
+
+try:
+    import pikepdf
+except ImportError:  # optional, the qpdf CLI is used instead
+    pikepdf = None
+
+logger = logging.getLogger("autoredactor")
+
+QPDF_TIMEOUT = 300
+
+# Linearized files have the linearization dictionary in the first object
+LINEARIZED_MARKER = b"/Linearized"
+LINEARIZED_HEAD_BYTES = 1024
+
+
+class OptimizationResult(NamedTuple):
+    method: str  # 'qpdf' | 'pikepdf'
+    original_size: int
+    optimized_size: int
+    seconds: float
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_size - self.optimized_size
+
+
+class PdfOptimizer:
+    """
+    Rewrites finished PDFs for fast web view.
+
+    The file is linearized, so built-in PDF viewers show the first page
+    before the rest has arrived, and its objects are packed into compressed
+    object streams. Uses the qpdf CLI, or pikepdf when it is installed;
+    without either files are left as they are (PyPDF2 can neither linearize
+    nor rewrite a file without losing its outline). Optimization is best
+    effort: on failure the original file is kept.
+    """
+
+    def __init__(self, enabled: bool, qpdf_binary: str):
+        self.enabled = enabled
+        self.qpdf_binary = qpdf_binary
+        self.optimized = 0
+        self.failed = 0
+        self.original_bytes = 0
+        self.saved_bytes = 0
+        self._lock = threading.Lock()
+        self._warned = False
+
+    @property
+    def method(self) -> Optional[str]:
+        if shutil.which(self.qpdf_binary):
+            return "qpdf"
+        if pikepdf is not None:
+            return "pikepdf"
+        return None
+
+    @staticmethod
+    def is_linearized(pdf_path: str) -> bool:
+        with open(pdf_path, "rb") as f:
+            return LINEARIZED_MARKER in f.read(LINEARIZED_HEAD_BYTES)
+
+    def optimize(self, pdf_path: str) -> Optional[OptimizationResult]:
+        """
+        Linearize and compress PDF in place.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            OptimizationResult, or None if disabled, unavailable, already
+            linearized or failed
+        """
+        if not self.enabled or self.is_linearized(pdf_path):
+            return None
+
+        method = self.method
+        if method is None:
+            if not self._warned:
+                self._warned = True
+                logger.warning(f"{self.qpdf_binary} и pikepdf недоступны, PDF не линеаризуются")
+            return None
+
+        started = time.monotonic()
+        original_size = os.path.getsize(pdf_path)
+        fd, tmp_path = tempfile.mkstemp(
+            suffix=".pdf", prefix=".optimize_", dir=os.path.dirname(pdf_path) or "."
+        )
+        os.close(fd)
+
+        try:
+            if method == "qpdf":
+                self._optimize_qpdf(pdf_path, tmp_path)
+            else:
+                self._optimize_pikepdf(pdf_path, tmp_path)
+
+            result = OptimizationResult(
+                method=method,
+                original_size=original_size,
+                optimized_size=os.path.getsize(tmp_path),
+                seconds=time.monotonic() - started
+            )
+            os.replace(tmp_path, pdf_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            with self._lock:
+                self.failed += 1
+            logger.warning(f"Не удалось оптимизировать PDF {pdf_path} ({method}): {e}")
+            return None
+
+        with self._lock:
+            self.optimized += 1
+            self.original_bytes += result.original_size
+            self.saved_bytes += result.saved_bytes
+
+        logger.info(
+            f"PDF линеаризован ({result.method}): "
+            f"{result.original_size / 1024 / 1024:.1f} МБ → "
+            f"{result.optimized_size / 1024 / 1024:.1f} МБ "
+            f"({-result.saved_bytes / max(result.original_size, 1):+.0%}) "
+            f"за {result.seconds:.2f} с"
+        )
+        return result
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "method": self.method,
+                "optimized": self.optimized,
+                "failed": self.failed,
+                "original_bytes": self.original_bytes,
+                "saved_bytes": self.saved_bytes,
+            }
+
+    def _optimize_qpdf(self, pdf_path: str, output_path: str):
+        result = subprocess.run(
+            [
+                self.qpdf_binary,
+                '--linearize',
+                '--object-streams=generate',
+                '--compress-streams=y',
+                '--recompress-flate',
+                pdf_path,
+                output_path
+            ],
+            capture_output=True,
+            text=True,
+            timeout=QPDF_TIMEOUT
+        )
+        # Exit code 3: written with warnings
+        if result.returncode not in (0, 3):
+            raise Exception(f"qpdf failed: {result.stderr}")
+
+    @staticmethod
+    def _optimize_pikepdf(pdf_path: str, output_path: str):
+        with pikepdf.open(pdf_path) as pdf:
+            pdf.save(
+                output_path,
+                linearize=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                compress_streams=True,
+                recompress_flate=True
+            )
+
+
+pdf_optimizer = PdfOptimizer(
+    enabled=settings.PDF_OPTIMIZE,
+    qpdf_binary=settings.QPDF_BINARY
+)
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.models import Article
+from app.models.article import ArticleResponse
+from app.models.journal import JournalSettings
+from app.services.pdf_generator import PDFGenerator
+from app.services.progress_bus import publish_article_update
+
+logger = logging.getLogger("autoredactor")
+
+# How often to look for a free LibreOffice worker while the pool is busy
+IDLE_POLL_INTERVAL = 0.5
+
+
+class PreconversionWorker:
+    """
+    Converts uploaded articles to PDF ahead of the build.
+
+    Articles are queued right after upload into a bounded queue; when it is
+    full the request is dropped and the build converts the article itself.
+    Conversions run only while the LibreOffice pool has an idle worker and
+    use at most all but one of them, so interactive conversions (template
+    uploads) do not wait behind a backlog. Results go to the shared
+    conversion cache under the default page-format fingerprint, where the
+    build finds them, and the PDF path and page count are recorded on the
+    article. Articles not converted yet are queued again at startup.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        pdf_generator: PDFGenerator,
+        queue_size: int,
+        fingerprint: str
+    ):
+        self.session_factory = session_factory
+        self.pdf_generator = pdf_generator
+        self.queue_size = max(1, queue_size)
+        self.fingerprint = fingerprint
+        self.converted = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: Optional["asyncio.Queue[UUID]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def concurrency(self) -> int:
+        return max(1, self.pdf_generator.pool.size - 1)
+
+    async def start(self):
+        """Start workers and requeue articles without a converted PDF."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+        await self._requeue_unconverted()
+
+    async def stop(self):
+        """Stop workers; a conversion in progress finishes in its thread."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, article_id: UUID) -> bool:
+        """Schedule pre-conversion of a committed article; False if it was dropped."""
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(article_id)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "converted": self.converted,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    async def _requeue_unconverted(self):
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(Article.id)
+                    .where(Article.pdf_path.is_(None))
+                    .order_by(Article.created_at.desc())
+                    .limit(self.queue_size)
+                )
+                article_ids = result.scalars().all()
+        except Exception as e:
+            logger.warning(f"Не удалось найти статьи без PDF: {e}")
+            return
+
+        for article_id in article_ids:
+            self.enqueue(article_id)
+        if article_ids:
+            logger.info(f"Предварительная конвертация: в очереди {len(article_ids)} статей")
+
+    async def _run(self):
+        while True:
+            article_id = await self._queue.get()
+            try:
+                await self._wait_idle()
+                await self._convert(article_id)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Предварительная конвертация статьи {article_id} не удалась: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _wait_idle(self):
+        while self.pdf_generator.pool.idle_count() == 0:
+            await asyncio.sleep(IDLE_POLL_INTERVAL)
+
+    async def _convert(self, article_id: UUID):
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Article.file_path, Article.file_hash).where(Article.id == article_id)
+            )
+            row = result.one_or_none()
+            if row is None:
+                # Deleted meanwhile
+                return
+
+            pdf_path, pages = await asyncio.to_thread(
+                self.pdf_generator.docx_to_pdf_cached, row.file_path, self.fingerprint, row.file_hash
+            )
+
+            await session.execute(
+                update(Article)
+                .where(Article.id == article_id)
+                .values(pdf_path=pdf_path, page_count=pages)
+            )
+            await session.commit()
+            self.converted += 1
+
+            result = await session.execute(select(Article).where(Article.id == article_id))
+            article = result.scalar_one_or_none()
+
+        if article is not None:
+            await publish_article_update(
+                ArticleResponse.model_validate(article).model_dump(mode="json")
+            )
+
+
+preconversion_worker = PreconversionWorker(
+    session_factory=AsyncSessionLocal,
+    pdf_generator=PDFGenerator(),
+    queue_size=settings.PRECONVERT_QUEUE_SIZE,
+    fingerprint=JournalSettings.default_format_fingerprint()
+)
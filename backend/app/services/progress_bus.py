@@ -0,0 +1,151 @@
+import json
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger("autoredactor")
+
+
+class Subscription:
+    """Stream of events from one channel."""
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Wait for the next event; None when timeout expires."""
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+
+class MemorySubscription(Subscription):
+    def __init__(self, bus: "ProgressBus", channel: str):
+        self.bus = bus
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue()
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.bus._unregister(self)
+
+
+class RedisSubscription(Subscription):
+    def __init__(self, client: aioredis.Redis, channel: str):
+        self.client = client
+        self.channel = channel
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+
+    async def start(self):
+        await self.pubsub.subscribe(self.channel)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        message = await self.pubsub.get_message(timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self):
+        await self.pubsub.unsubscribe(self.channel)
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class ProgressBus:
+    """
+    Pub/sub channel for progress events.
+
+    With the ``redis`` backend events go through Redis pub/sub, so the web
+    process sees updates published by builds running in Celery workers. The
+    ``memory`` backend keeps events in-process, for eager mode and tests;
+    publishers may run in any thread or event loop.
+    """
+
+    def __init__(self, backend: str, redis_url: str):
+        self.backend = backend
+        self.redis_url = redis_url
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[MemorySubscription]] = {}
+        self._redis: Optional[redis.Redis] = None
+
+    async def publish(self, channel: str, event: dict):
+        """Publish event to all current subscribers of channel."""
+        if self.backend == "memory":
+            with self._lock:
+                subscribers = list(self._subscribers.get(channel, ()))
+            for subscription in subscribers:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, event)
+            return
+
+        # Sync client: publishers run in short-lived event loops (Celery tasks)
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(self.redis_url)
+        await asyncio.to_thread(self._redis.publish, channel, json.dumps(event))
+
+    async def subscribe(self, channel: str) -> Subscription:
+        """Start listening on channel. Events published before this call are not delivered."""
+        if self.backend == "memory":
+            subscription = MemorySubscription(self, channel)
+            with self._lock:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+            return subscription
+
+        subscription = RedisSubscription(aioredis.from_url(self.redis_url), channel)
+        await subscription.start()
+        return subscription
+
+    def _unregister(self, subscription: MemorySubscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+progress_bus = ProgressBus(settings.PROGRESS_BUS_BACKEND, settings.REDIS_URL)
+
+
+def generation_channel(task_id) -> str:
+    return f"generation:{task_id}"
+
+
+def generation_event(task) -> dict:
+    """Progress event payload for a GenerationTask, same shape as GenerationStatus."""
+    return {
+        "status": task.status,
+        "progress": task.progress or 0,
+        "current_step": task.current_step,
+        "error_message": task.error_message,
+    }
+
+
+async def publish_generation_status(task):
+    """Push current state of a GenerationTask to its subscribers."""
+    try:
+        await progress_bus.publish(generation_channel(task.id), generation_event(task))
+    except Exception as e:
+        # Subscribers can still fall back to the status endpoint
+        logger.warning(f"Не удалось опубликовать прогресс задачи {task.id}: {e}")
+
+
+def articles_channel(session_id) -> str:
+    return f"articles:{session_id}"
+
+
+async def publish_article_update(article_event: dict):
+    """Push updated article (ArticleResponse payload) to subscribers of its session."""
+    try:
+        await progress_bus.publish(articles_channel(article_event["session_id"]), article_event)
+    except Exception as e:
+        logger.warning(f"Не удалось опубликовать обновление статьи {article_event['id']}: {e}")
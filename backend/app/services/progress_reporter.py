@@ -0,0 +1,64 @@
+import time
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import GenerationTask
+from app.services.progress_bus import publish_generation_status
+
+logger = logging.getLogger("autoredactor")
+
+
+class ProgressReporter:
+    """
+    Coalesces progress updates of one GenerationTask.
+
+    Every update is pushed to progress subscribers right away. DB writes are
+    throttled by progress delta and by time and are awaited in place: the
+    session is shared with the build, and an AsyncSession must not be used
+    by two coroutines at once. ``close()`` persists the final state.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        task: GenerationTask,
+        min_delta: int = settings.PROGRESS_CHECKPOINT_STEP,
+        min_interval: float = settings.PROGRESS_FLUSH_INTERVAL
+    ):
+        self.session = session
+        self.task = task
+        self.min_delta = min_delta
+        self.min_interval = min_interval
+        self.writes = 0
+        self._persisted_progress = task.progress or 0
+        self._persisted_at = time.monotonic()
+
+    async def update(self, progress: int, step: str):
+        """Report progress of the build."""
+        self.task.progress = progress
+        self.task.current_step = step
+        self.task.status = "processing"
+        await publish_generation_status(self.task)
+
+        due = (
+            progress - self._persisted_progress >= self.min_delta
+            or time.monotonic() - self._persisted_at >= self.min_interval
+        )
+        if due:
+            await self._write()
+
+    async def close(self):
+        """Persist the current state."""
+        await self._write()
+
+    async def _write(self):
+        self._persisted_progress = self.task.progress or 0
+        self._persisted_at = time.monotonic()
+        self.writes += 1
+        try:
+            await self.session.commit()
+        except Exception as e:
+            # Progress is advisory; the build itself must not fail on it
+            logger.warning(f"Не удалось сохранить прогресс задачи {self.task.id}: {e}")
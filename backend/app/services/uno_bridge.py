@@ -0,0 +1,108 @@
+"""
+Bridge between the application and a resident headless LibreOffice.
+
+The UNO bindings ship with LibreOffice for the system interpreter
+(python3-uno on Debian), not for the Python the application runs on, so
+this script is started under LIBREOFFICE_PYTHON as a separate process. It
+connects to soffice listening on a named pipe and serves requests read
+from stdin, one JSON object per line, answering each with one line on
+stdout:
+
+    {"op": "ping"}                              -> {"ok": true}
+    {"op": "convert", "src": ..., "dst": ...}   -> {"ok": true}
+
+Failures answer {"ok": false, "error": "..."}. A first {"ok": true} line
+is written once connected. Closing stdin terminates soffice and the
+bridge. The script must not import the application.
+"""
+import sys
+import json
+import time
+from pathlib import Path
+
+# Exit code when the interpreter has no UNO bindings
+EXIT_NO_UNO = 3
+
+
+def reply(**payload):
+    sys.stdout.write(json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    pipe_name, timeout = sys.argv[1], float(sys.argv[2])
+
+    try:
+        import uno
+        from com.sun.star.beans import PropertyValue
+        from com.sun.star.connection import NoConnectException
+    except ImportError:
+        sys.exit(EXIT_NO_UNO)
+
+    def properties(**kwargs):
+        result = []
+        for name, value in kwargs.items():
+            prop = PropertyValue()
+            prop.Name = name
+            prop.Value = value
+            result.append(prop)
+        return tuple(result)
+
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            context = resolver.resolve(
+                f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext"
+            )
+            break
+        except NoConnectException:
+            if time.monotonic() > deadline:
+                reply(ok=False, error="LibreOffice did not start in time")
+                sys.exit(1)
+            time.sleep(0.25)
+
+    desktop = context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+    reply(ok=True)
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            if request["op"] == "ping":
+                # Cheap round-trip to soffice
+                desktop.getComponents()
+            elif request["op"] == "convert":
+                document = desktop.loadComponentFromURL(
+                    Path(request["src"]).resolve().as_uri(),
+                    "_blank",
+                    0,
+                    properties(Hidden=True, ReadOnly=True)
+                )
+                if document is None:
+                    raise Exception(f"LibreOffice could not open {request['src']}")
+                try:
+                    document.storeToURL(
+                        Path(request["dst"]).resolve().as_uri(),
+                        properties(FilterName="writer_pdf_Export")
+                    )
+                finally:
+                    document.close(True)
+            else:
+                raise Exception(f"Unknown operation {request['op']}")
+            reply(ok=True)
+        except Exception as e:
+            reply(ok=False, error=str(e))
+
+    try:
+        desktop.terminate()
+    except Exception:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+import asyncio
+import hashlib
+import tempfile
+from typing import BinaryIO, NamedTuple
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+
+class UploadTooLargeError(Exception):
+    """Uploaded file exceeds the size limit."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"File too large (max {max_bytes // (1024 * 1024)}MB)")
+
+
+class StoredUpload(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+async def save_upload(
+    upload: UploadFile,
+    dest_path: str,
+    max_bytes: int = settings.MAX_FILE_SIZE_MB * 1024 * 1024,
+    chunk_size: int = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+) -> StoredUpload:
+    """
+    Stream uploaded file to disk in fixed-size chunks.
+
+    The size limit is checked as chunks arrive and SHA-256 is computed in
+    the same pass. Data goes to a temp file in the destination directory,
+    which is fsynced and atomically renamed, so dest_path never holds a
+    partial file. Only one chunk is held in memory at a time.
+
+    Args:
+        upload: Uploaded file
+        dest_path: Final path of the file
+        max_bytes: Maximum allowed size
+        chunk_size: Read/write chunk size
+
+    Returns:
+        StoredUpload with path, size and hex SHA-256
+
+    Raises:
+        UploadTooLargeError: If the file exceeds max_bytes; nothing is stored
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(dest_path) or ".", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                await asyncio.to_thread(_write_chunk, out, digest, chunk)
+            await asyncio.to_thread(_sync, out)
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return StoredUpload(dest_path, size, digest.hexdigest())
+
+
+def file_sha256(path: str, chunk_size: int = settings.UPLOAD_CHUNK_SIZE_KB * 1024) -> str:
+    """SHA-256 of a stored file, read in chunks; blocking, call in a thread."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_chunk(out: BinaryIO, digest, chunk: bytes):
+    # hashlib releases the GIL for large buffers, so both run off the loop
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _sync(out: BinaryIO):
+    out.flush()
+    os.fsync(out.fileno())
@@ -0,0 +1,216 @@
+# backend/app/worker.py
+import os
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from celery import Celery
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_shutdown
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.models import Article, Template, GenerationTask
+from app.models.journal import JournalSettings
+from app.services.pdf_generator import PDFGenerator
+from app.services.journal_builder import JournalBuilder
+from app.services.libreoffice_pool import libreoffice_pool
+from app.services.progress_bus import publish_generation_status
+from app.services.upload_storage import file_sha256
+
+logger = logging.getLogger("autoredactor")
+
+# Time for the build to record its own timeout before Celery interrupts it
+SOFT_LIMIT_GRACE = 30
+
+TIMEOUT_MESSAGE = "Превышено время генерации"
+
+celery_app = Celery(
+    "autoredactor",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    # Ack only after the build finished: a crashed worker puts the job back
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    worker_concurrency=settings.GENERATION_CONCURRENCY,
+    # The build stops itself at GENERATION_SOFT_TIME_LIMIT; Celery's soft limit is a backstop
+    task_soft_time_limit=settings.GENERATION_SOFT_TIME_LIMIT + SOFT_LIMIT_GRACE,
+    task_time_limit=settings.GENERATION_TIME_LIMIT,
+    # Unacked jobs are redelivered only after this timeout, keep it above the hard limit
+    broker_transport_options={"visibility_timeout": settings.GENERATION_TIME_LIMIT + 60},
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+)
+
+pdf_generator = PDFGenerator()
+journal_builder = JournalBuilder(pdf_generator)
+
+
+@celery_app.task(name="generate_journal")
+def generate_journal(task_id: str, article_ids: list, template_dict: dict, settings_dict: dict):
+    """Celery entry point for journal generation."""
+    try:
+        asyncio.run(generate_journal_task(task_id, article_ids, template_dict, settings_dict))
+    except SoftTimeLimitExceeded:
+        # Raised by a signal handler while the loop waits in select(), so it
+        # leaves asyncio.run instead of reaching the handlers in the coroutine
+        asyncio.run(fail_generation_task(task_id, TIMEOUT_MESSAGE))
+
+
+async def generate_journal_task(
+    task_id: str,
+    article_ids: list,
+    template_dict: dict,
+    settings_dict: dict
+):
+    """
+    Build journal and keep its GenerationTask row in sync.
+
+    Every run gets its own engine without pooling: the task may execute in
+    a fresh event loop (Celery worker or eager mode), and pooled asyncpg
+    connections cannot be shared between loops.
+    """
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_maker() as db:
+            result = await db.execute(
+                select(GenerationTask).where(GenerationTask.id == uuid.UUID(task_id))
+            )
+            task = result.scalar_one_or_none()
+            if task is None:
+                logger.warning(f"Задача генерации {task_id} не найдена")
+                return
+            if task.status in ("done", "error"):
+                return
+
+            # A redelivered job means the previous worker died mid-build
+            task.attempts = (task.attempts or 0) + 1
+            if task.attempts > settings.GENERATION_MAX_ATTEMPTS:
+                task.status = "error"
+                task.error_message = "Превышено число попыток генерации"
+                task.completed_at = datetime.utcnow()
+                await db.commit()
+                await publish_generation_status(task)
+                return
+
+            task.status = "processing"
+            task.started_at = datetime.utcnow()
+            await db.commit()
+            await publish_generation_status(task)
+
+            try:
+                async with asyncio.timeout(settings.GENERATION_SOFT_TIME_LIMIT):
+                    await _build(db, task, article_ids, template_dict, settings_dict)
+            except TimeoutError:
+                # The session may have been cancelled mid-operation
+                await fail_generation_task(task_id, TIMEOUT_MESSAGE, session_maker)
+            except Exception as e:
+                task.status = "error"
+                task.error_message = str(e)
+                task.completed_at = datetime.utcnow()
+                await db.commit()
+                await publish_generation_status(task)
+    finally:
+        await engine.dispose()
+
+
+async def fail_generation_task(
+    task_id: str,
+    message: str,
+    session_maker: Optional[async_sessionmaker] = None
+):
+    """Mark an unfinished task as failed using a fresh session."""
+    engine = None
+    if session_maker is None:
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_maker() as db:
+            result = await db.execute(
+                update(GenerationTask)
+                .where(
+                    GenerationTask.id == uuid.UUID(task_id),
+                    GenerationTask.status.notin_(("done", "error"))
+                )
+                .values(status="error", error_message=message, completed_at=datetime.utcnow())
+                .returning(GenerationTask)
+            )
+            task = result.scalar_one_or_none()
+            await db.commit()
+        if task is not None:
+            await publish_generation_status(task)
+    except Exception as e:
+        logger.error(f"Не удалось отметить задачу генерации {task_id} как ошибочную: {e}")
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+
+async def _build(
+    db: AsyncSession,
+    task: GenerationTask,
+    article_ids: list,
+    template_dict: dict,
+    settings_dict: dict
+):
+    # Get articles
+    result = await db.execute(
+        select(Article).where(Article.id.in_([uuid.UUID(aid) for aid in article_ids]))
+    )
+    articles = result.scalars().all()
+
+    # Sort articles if not already sorted
+    articles = sorted(articles, key=lambda a: a.sort_order or 0)
+
+    # Get templates ('title_id' -> 'title')
+    templates = {}
+    for key, template_id in template_dict.items():
+        key = key.removesuffix('_id')
+        if template_id:
+            result = await db.execute(
+                select(Template).where(Template.id == uuid.UUID(str(template_id)))
+            )
+            templates[key] = result.scalar_one_or_none()
+        else:
+            templates[key] = None
+
+    # Build journal
+    journal_settings = JournalSettings(**settings_dict)
+
+    output_path = os.path.join(
+        settings.UPLOAD_DIR,
+        f"journal_{task.id}.pdf"
+    )
+
+    result_path = await journal_builder.build_journal(
+        db,
+        task,
+        list(articles),
+        templates,
+        journal_settings,
+        output_path
+    )
+
+    # Update task
+    task.status = "done"
+    task.result_path = result_path
+    task.result_hash = await asyncio.to_thread(file_sha256, result_path)
+    task.progress = 100
+    task.completed_at = datetime.utcnow()
+    await db.commit()
+    await publish_generation_status(task)
+
+
+@worker_process_shutdown.connect
+def _shutdown_libreoffice(**kwargs):
+    libreoffice_pool.shutdown()
@@ -0,0 +1,5 @@
+-- Генерация журналов в очереди Celery: идентификатор задачи Celery,
+-- счётчик попыток и время начала обработки (для проверки зависших задач)
+ALTER TABLE generation_tasks ADD COLUMN IF NOT EXISTS celery_task_id VARCHAR(50);
+ALTER TABLE generation_tasks ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0;
+ALTER TABLE generation_tasks ADD COLUMN IF NOT EXISTS started_at TIMESTAMP;
@@ -0,0 +1,5 @@
+-- Фоновое извлечение метаданных статей. Уже загруженные статьи
+-- считаются обработанными, чтобы их не извлекать заново.
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS metadata_status VARCHAR(20);
+UPDATE articles SET metadata_status = 'ready' WHERE metadata_status IS NULL;
+ALTER TABLE articles ALTER COLUMN metadata_status SET DEFAULT 'pending';
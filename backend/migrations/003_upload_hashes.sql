@@ -0,0 +1,3 @@
+-- SHA-256 загруженных файлов (ключ кэша конвертации)
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS file_hash VARCHAR(64);
+ALTER TABLE templates ADD COLUMN IF NOT EXISTS file_hash VARCHAR(64);
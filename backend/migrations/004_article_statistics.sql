@@ -0,0 +1,6 @@
+-- Статистика документа, заполняется при загрузке статьи
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS word_count INTEGER;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS char_count INTEGER;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS image_count INTEGER;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS page_count INTEGER;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS text_head TEXT;
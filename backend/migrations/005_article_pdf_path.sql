@@ -0,0 +1,2 @@
+-- Путь к PDF статьи в кэше конвертации (предварительная конвертация)
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS pdf_path VARCHAR(500);
@@ -0,0 +1,2 @@
+-- Манифест сборки (JSON BuildManifest) для повторного использования страниц
+ALTER TABLE generation_tasks ADD COLUMN IF NOT EXISTS manifest TEXT;
@@ -0,0 +1,3 @@
+-- SHA-256 готовых PDF, используется как ETag при скачивании
+ALTER TABLE generation_tasks ADD COLUMN IF NOT EXISTS result_hash VARCHAR(64);
+ALTER TABLE archive ADD COLUMN IF NOT EXISTS file_hash VARCHAR(64);
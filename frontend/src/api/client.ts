@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Article, Archive, GenerationStatus, GenerationTask, JournalSettings, PreviewStructure } from '@/types';
+import type { Article, Archive, BatchUploadResult, GenerationStatus, GenerationTask, JournalSettings, PreviewStructure } from '@/types';
 
 const API_BASE = '/api';
 
@@ -26,6 +26,21 @@ export const uploadArticle = async (file: File, sessionId?: string): Promise<Art
   return response.data;
 };
 
+export const uploadArticles = async (files: File[], sessionId?: string): Promise<BatchUploadResult> => {
+  const formData = new FormData();
+  files.forEach((file) => formData.append('files', file));
+  if (sessionId) {
+    formData.append('session_id', sessionId);
+  }
+
+  const response = await api.post('/upload/articles', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
+  return response.data;
+};
+
 export const uploadTemplate = async (
   file: File,
   type: 'title' | 'intro' | 'outro',
@@ -62,6 +77,18 @@ export const deleteArticle = async (articleId: string): Promise<void> => {
   await api.delete(`/articles/${articleId}`);
 };
 
+// Subscribe to article updates of a session (metadata extracted in the background).
+export const subscribeArticleUpdates = (
+  sessionId: string,
+  onArticle: (article: Article) => void
+): (() => void) => {
+  const source = new EventSource(`${API_BASE}/articles/events?session_id=${sessionId}`);
+  source.onmessage = (event) => {
+    onArticle(JSON.parse(event.data));
+  };
+  return () => source.close();
+};
+
 export const sortArticles = async (sessionId: string): Promise<any> => {
   const response = await api.post('/articles/sort', null, {
     params: { session_id: sessionId },
@@ -93,6 +120,42 @@ export const getGenerationStatus = async (taskId: string): Promise<GenerationSta
   return response.data;
 };
 
+// Subscribe to generation progress pushed by the server (SSE).
+// Falls back to polling the status endpoint if the stream cannot be opened.
+export const subscribeGenerationStatus = (
+  taskId: string,
+  onStatus: (status: GenerationStatus) => void
+): (() => void) => {
+  let interval: ReturnType<typeof setInterval> | null = null;
+  const source = new EventSource(`${API_BASE}/generate/${taskId}/events`);
+
+  const isFinal = (status: GenerationStatus) =>
+    status.status === 'done' || status.status === 'error';
+
+  const close = () => {
+    source.close();
+    if (interval) clearInterval(interval);
+  };
+
+  source.onmessage = (event) => {
+    const status: GenerationStatus = JSON.parse(event.data);
+    onStatus(status);
+    if (isFinal(status)) close();
+  };
+
+  source.onerror = () => {
+    source.close();
+    if (interval) return;
+    interval = setInterval(async () => {
+      const status = await getGenerationStatus(taskId);
+      onStatus(status);
+      if (isFinal(status)) close();
+    }, 2000);
+  };
+
+  return close;
+};
+
 export const downloadJournal = (taskId: string): string => {
   return `${API_BASE}/generate/${taskId}/download`;
 };
@@ -24,6 +24,13 @@ export function ArticleCard({ article, onUpdate, onDelete, onPreview }: ArticleC
     setIsEditing(false);
   };
 
+  // Metadata may have arrived after mount
+  const handleEdit = () => {
+    setEditTitle(article.title || '');
+    setEditAuthor(article.author || '');
+    setIsEditing(true);
+  };
+
   const handleCancel = () => {
     setEditTitle(article.title || '');
     setEditAuthor(article.author || '');
@@ -88,7 +95,12 @@ export function ArticleCard({ article, onUpdate, onDelete, onPreview }: ArticleC
                 "{article.title || 'Untitled'}"
               </p>
               <p className="text-xs text-muted-foreground mt-1">
-                {article.filename} • {article.ai_confidence ? `${Math.round(article.ai_confidence * 100)}% confidence` : ''}
+                {article.filename} •{' '}
+                {article.metadata_status === 'pending'
+                  ? 'Распознавание…'
+                  : article.metadata_status === 'error'
+                    ? 'Не удалось распознать'
+                    : article.ai_confidence ? `${Math.round(article.ai_confidence * 100)}% confidence` : ''}
               </p>
             </div>
           )}
@@ -96,7 +108,7 @@ export function ArticleCard({ article, onUpdate, onDelete, onPreview }: ArticleC
 
         {!isEditing && (
           <div className="flex items-center gap-1">
-            <Button size="sm" variant="ghost" onClick={() => setIsEditing(true)}>
+            <Button size="sm" variant="ghost" onClick={handleEdit}>
               <Edit2 className="w-4 h-4" />
             </Button>
             {onPreview && (
@@ -1,4 +1,4 @@
-import { useCallback, useState } from 'react';
+import { useCallback, useEffect, useState } from 'react';
 import { FileUploader } from '@/components/FileUploader/FileUploader';
 import { ArticleCard } from '@/components/ArticleCard/ArticleCard';
 import { Button } from '@/components/ui/button';
@@ -23,13 +23,32 @@ export function EditorPage() {
   const [uploading, setUploading] = useState(false);
   const [sorting, setSorting] = useState(false);
 
+  // Metadata of uploaded articles arrives later, pushed by the server
+  useEffect(() => {
+    if (!sessionId) return;
+    const unsubscribe = api.subscribeArticleUpdates(sessionId, (article) => {
+      updateArticle(article.id, article);
+    });
+    // Catch up on updates that happened before the stream was open
+    api.getArticles(sessionId).then(setArticles).catch(() => undefined);
+    return unsubscribe;
+  }, [sessionId, updateArticle, setArticles]);
+
   const handleFilesUpload = useCallback(
     async (files: File[]) => {
       setUploading(true);
       try {
-        for (const file of files) {
-          const article = await api.uploadArticle(file, sessionId || undefined);
-          addArticle(article);
+        const { results } = await api.uploadArticles(files, sessionId || undefined);
+        const failed: string[] = [];
+        for (const item of results) {
+          if (item.article) {
+            addArticle(item.article);
+          } else {
+            failed.push(`${item.filename}: ${item.error}`);
+          }
+        }
+        if (failed.length > 0) {
+          alert(`Не удалось загрузить:\n${failed.join('\n')}`);
         }
       } catch (error) {
         console.error('Upload error:', error);
@@ -94,20 +113,17 @@ export function EditorPage() {
         }
       );
 
-      // Poll for status
+      // Subscribe to status updates
       const taskId = result.task_id;
-      const interval = setInterval(async () => {
-        const status = await api.getGenerationStatus(taskId);
+      api.subscribeGenerationStatus(taskId, (status) => {
         console.log('Generation status:', status);
 
         if (status.status === 'done') {
-          clearInterval(interval);
           window.open(api.downloadJournal(taskId), '_blank');
         } else if (status.status === 'error') {
-          clearInterval(interval);
           alert(`Ошибка генерации: ${status.error_message}`);
         }
-      }, 2000);
+      });
     } catch (error) {
       console.error('Generation error:', error);
       alert('Ошибка запуска генерации');
@@ -8,6 +8,18 @@ export interface Article {
   sort_order: number | null;
   created_at: string;
   ai_confidence: number | null;
+  metadata_status: 'pending' | 'ready' | 'error' | null;
+  word_count: number | null;
+  page_count: number | null;
+}
+
+export interface BatchUploadResult {
+  session_id: string;
+  results: {
+    filename: string;
+    article: Article | null;
+    error: string | null;
+  }[];
 }
 
 export interface Template {
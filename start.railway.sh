@@ -33,6 +33,11 @@ echo "Starting FastAPI Backend на порту $BACKEND_PORT..."
 export PYTHONPATH="/app/backend:$PYTHONPATH"
 cd /app/backend
 
+# Celery worker для генерации журналов (отдельно от веб-процесса)
+echo "Starting Celery worker..."
+celery -A app.worker worker --loglevel=info &
+WORKER_PID=$!
+
 # Правильная команда (app.main:app — запускаем из /app/backend с PYTHONPATH)
 exec uvicorn app.main:app \
     --host 0.0.0.0 \
@@ -55,8 +60,8 @@ echo " - Health check: http://localhost:$PORT/health"
 # ──────────────────────────────────────────────────────────────
 shutdown() {
     echo "Shutting down..."
-    kill $BACKEND_PID $NGINX_PID 2>/dev/null || true
-    wait $BACKEND_PID $NGINX_PID 2>/dev/null || true
+    kill $BACKEND_PID $NGINX_PID $WORKER_PID 2>/dev/null || true
+    wait $BACKEND_PID $NGINX_PID $WORKER_PID 2>/dev/null || true
     echo "Shutdown complete"
     exit 0
 }
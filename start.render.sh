@@ -20,9 +20,14 @@ NGINX_PID=$!
 # Wait a bit for nginx to start
 sleep 2
 
+# Start Celery worker for journal generation
+cd /app/backend
+echo "⚙️ Starting Celery worker..."
+celery -A app.worker worker --loglevel=info &
+WORKER_PID=$!
+
 # Start FastAPI backend
 echo "🐍 Starting FastAPI Backend..."
-cd /app/backend
 uvicorn app.main:app --host 127.0.0.1 --port ${BACKEND_PORT:-8000} &
 BACKEND_PID=$!
 
@@ -31,4 +36,4 @@ echo "   - Nginx (Frontend): http://localhost:$PORT"
 echo "   - Backend API: http://localhost:${BACKEND_PORT:-8000}"
 
 # Wait for both processes
-wait $NGINX_PID $BACKEND_PID
+wait $NGINX_PID $BACKEND_PID $WORKER_PID